@@ -1,8 +1,11 @@
 import asyncio
+import base64
+import hashlib
 import os
 from pathlib import Path
 from fastapi import FastAPI, HTTPException, Depends, Header, Request
-from fastapi.responses import Response
+from fastapi.responses import Response, ORJSONResponse, StreamingResponse
+from starlette.datastructures import Headers, MutableHeaders
 from models.responses import (
     PingResponse, 
     SearchResult,
@@ -16,6 +19,8 @@ from models.requests import (
     GetHtmlRequest,
     SelectorRequest,
     InteractRequest,
+    Selector,
+    Action,
     HtmlAction,
     TextAction,
     ClickAction,
@@ -32,54 +37,82 @@ from models.requests import (
 )
 from contextlib import asynccontextmanager
 from patchright.async_api import async_playwright, Playwright
-from patchright.async_api import Browser, BrowserContext
-from patchright.async_api import Page, ElementHandle
+from patchright.async_api import Browser, BrowserContext, CDPSession
+from patchright.async_api import Page, Locator
+from patchright.async_api import TimeoutError as PlaywrightTimeoutError
 import uuid
+import secrets
 import logging
 import re
-from typing import List, Annotated, Optional, AsyncGenerator
+from typing import List, Annotated, Optional, AsyncGenerator, Union, Any, Hashable, Callable, Awaitable
 from pydantic import BaseModel, Field
 
 import shutil
+import time
+import weakref
+import zlib
+import orjson
+import httpx
+import oxipng
+from selectolax.lexbor import LexborHTMLParser
+from collections import deque, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import groupby, islice, takewhile
 
 # Default profile configuration
 PROFILES_DIR = Path("./profiles")
 DEFAULT_BROWSER_ID = "default"
+# Number of blank pages kept open per browser, ready to be handed out to new sessions
+PAGE_POOL_SIZE = int(os.getenv("PAGE_POOL_SIZE", "2"))
+# Blank pages kept open per browser in their own fresh contexts, for isolated sessions
+CONTEXT_POOL_SIZE = int(os.getenv("CONTEXT_POOL_SIZE", "2"))
+# Sessions unused for this many seconds are ended automatically (0 disables eviction)
+SESSION_IDLE_TIMEOUT = float(os.getenv("SESSION_IDLE_TIMEOUT", "0"))
+# Maximum open sessions per browser; the least recently used one is ended past it (0 means no limit)
+MAX_SESSIONS = int(os.getenv("MAX_SESSIONS", "0"))
+# Maximum open browsers besides the default one; the least recently used one is closed past it (0 means no limit)
+MAX_BROWSERS = int(os.getenv("MAX_BROWSERS", "0"))
+# Requests allowed to drive browser pages at once; past this Chromium thrashes instead of getting more done
+BROWSER_CONCURRENCY = int(os.getenv("BROWSER_CONCURRENCY", str(2 * (os.cpu_count() or 1))))
+
+
+# Lock files Chrome leaves in a profile directory when it doesn't shut down cleanly
+PROFILE_LOCK_NAMES = frozenset({"SingletonLock", "SingletonSocket", "SingletonCookie"})
 
 
 def cleanup_profile_locks(profile_path: Path):
     """Remove Chrome lock files from a profile directory to prevent startup errors."""
-    if not profile_path.exists():
+    # One directory listing answers existence and file type for every entry, including broken symlinks
+    try:
+        entries = os.scandir(profile_path)
+    except (FileNotFoundError, NotADirectoryError):
         return
-        
-    locks = [
-        "SingletonLock",
-        "SingletonSocket",
-        "SingletonCookie"
-    ]
     
-    for lock_name in locks:
-        lock_file = profile_path / lock_name
-        # Check if file exists or is a broken symlink
-        if os.path.lexists(lock_file):
+    with entries:
+        for entry in entries:
+            if entry.name not in PROFILE_LOCK_NAMES:
+                continue
             try:
-                if os.path.islink(lock_file):
-                    os.unlink(lock_file)
-                elif lock_file.is_dir():
-                    shutil.rmtree(lock_file)
+                if entry.is_dir(follow_symlinks=False):
+                    shutil.rmtree(entry.path)
                 else:
-                    lock_file.unlink()
-                logger.info(f"Removed lock file: {lock_file}")
+                    os.unlink(entry.path)
+                logger.info("Removed lock file: %s", entry.path)
             except Exception as e:
-                logger.warning(f"Failed to remove lock file {lock_file}: {e}")
+                logger.warning("Failed to remove lock file %s: %s", entry.path, e)
 
 
 
 class PingFilter(logging.Filter):
     """Filter out /ping health check requests from access logs."""
     def filter(self, record: logging.LogRecord) -> bool:
-        message = record.getMessage()
-        return "/ping" not in message
+        # Access records carry (client_addr, method, path, http_version, status_code) as args;
+        # checking the path directly saves formatting every message just to search it
+        args = record.args
+        if isinstance(args, tuple) and len(args) >= 3 and isinstance(args[2], str):
+            return "/ping" not in args[2]
+        return "/ping" not in record.getMessage()
 
 uvicorn_access_logger = logging.getLogger("uvicorn.access")
 uvicorn_access_logger.addFilter(PingFilter())
@@ -92,6 +125,15 @@ handler.setFormatter(formatter)
 logger.addHandler(handler)
 
 
+async def prefetch_page(page: Page, url: str):
+    """Navigate a page ahead of its first request; failures are logged, not raised."""
+    try:
+        await page.goto(url, wait_until="domcontentloaded")
+        logger.info("Prefetched %s", url)
+    except Exception as e:
+        logger.warning("Failed to prefetch %s: %s", url, e)
+
+
 class BrowserInfo:
     """Container for browser, context and its associated pages."""
     def __init__(self, browser: Browser, context: BrowserContext, profile_path: Optional[Path] = None):
@@ -99,7 +141,233 @@ class BrowserInfo:
         self.context = context
         self.profile_path = profile_path
         self.pages: dict[str, Page] = {}
+        self.page_pool: deque[Page] = deque()
+        # Monotonic time each session was last used, least recently used first
+        self.last_used: OrderedDict[str, float] = OrderedDict()
+        # Requests currently working each session's page; such sessions are never evicted,
+        # since their page would be reset and handed to another session mid-request
+        self.in_use: dict[str, int] = {}
+        # Background navigations started by /start_session, awaited by the session's first request
+        self.prefetches: dict[str, asyncio.Task] = {}
+        # "close" listeners dropping a session as soon as its page closes
+        self.close_listeners: dict[str, Callable[[Page], None]] = {}
+        self.refill_task: Optional[asyncio.Task] = None
+        # Pages of isolated sessions, each in its own context that is closed with the session
+        self.isolated_contexts: dict[Page, BrowserContext] = {}
+        self.isolated_pool: deque[Page] = deque()
+        self.isolated_refill_task: Optional[asyncio.Task] = None
+        # Isolated session ids; kept when a session's page closes, so its next request
+        # gets a fresh isolated context rather than a page sharing the browser's cookies
+        self.isolated_sessions: set[str] = set()
+    
+    async def fill_pool(self, size: int = PAGE_POOL_SIZE):
+        """Open blank pages until the pool holds `size` of them."""
+        while len(self.page_pool) < size:
+            self.page_pool.append(await self.context.new_page())
+    
+    async def _refill_pool(self):
+        try:
+            await self.fill_pool()
+        except Exception as e:
+            logger.warning("Failed to refill page pool: %s", e)
+    
+    async def acquire_page(self) -> Page:
+        """
+        Take a warm page from the pool, or open a new one if the pool is empty.
+        
+        The pool is topped back up in the background, so the next session
+        finds a warm page too.
+        """
+        page = None
+        while self.page_pool:
+            candidate = self.page_pool.popleft()
+            if not candidate.is_closed():
+                page = candidate
+                break
+        if page is None:
+            page = await self.context.new_page()
+        if self.refill_task is None or self.refill_task.done():
+            self.refill_task = asyncio.create_task(self._refill_pool())
+        return page
+    
+    async def _new_isolated_page(self) -> Page:
+        context = await self.browser.new_context(no_viewport=True)
+        page = await context.new_page()
+        self.isolated_contexts[page] = context
+        return page
+    
+    async def fill_isolated_pool(self, size: int = CONTEXT_POOL_SIZE):
+        """Open blank pages in fresh contexts until the isolated pool holds `size` of them."""
+        while len(self.isolated_pool) < size:
+            self.isolated_pool.append(await self._new_isolated_page())
+    
+    async def _refill_isolated_pool(self):
+        try:
+            await self.fill_isolated_pool()
+        except Exception as e:
+            logger.warning("Failed to refill isolated context pool: %s", e)
+    
+    async def acquire_isolated_page(self) -> Page:
+        """
+        Take a page in its own browser context, sharing no cookies or storage with other sessions.
+        
+        Like acquire_page, a warm one is taken from a pool that is topped up in the
+        background; the pool is only filled once isolated sessions are in use.
+        """
+        page = None
+        while self.isolated_pool:
+            candidate = self.isolated_pool.popleft()
+            if not candidate.is_closed():
+                page = candidate
+                break
+            await self.release_page(candidate)
+        if page is None:
+            page = await self._new_isolated_page()
+        if self.isolated_refill_task is None or self.isolated_refill_task.done():
+            self.isolated_refill_task = asyncio.create_task(self._refill_isolated_pool())
+        return page
+    
+    def is_isolated(self, page: Page) -> bool:
+        """Whether the page belongs to an isolated session context."""
+        return page in self.isolated_contexts
+    
+    async def release_page(self, page: Page):
+        """
+        Return a page to the pool once its session is done.
+        
+        The page is reset to about:blank so the next session starts clean.
+        Pages that can't be reset, or that don't fit in the pool, are closed.
+        Isolated pages are never reused: their whole context is closed.
+        """
+        context = self.isolated_contexts.pop(page, None)
+        if context is not None:
+            await context.close()
+            return
+        if len(self.page_pool) < PAGE_POOL_SIZE and not page.is_closed():
+            try:
+                await page.goto("about:blank")
+                self.page_pool.append(page)
+                return
+            except Exception as e:
+                logger.warning("Error resetting page for reuse: %s", e)
+        if not page.is_closed():
+            await page.close()
 
+    def assign(self, session_id: str, page: Page):
+        """Attach a page to a session; the session is dropped as soon as the page closes."""
+        def on_close(_: Page):
+            if self.pages.get(session_id) is page:
+                logger.info("Page for session %s was closed, removing session", session_id)
+                self.forget(session_id, keep_isolated=True)
+                # Closes the context an isolated page leaves behind
+                asyncio.ensure_future(self.release_page(page))
+        
+        if self.is_isolated(page):
+            self.isolated_sessions.add(session_id)
+        self.pages[session_id] = page
+        self.close_listeners[session_id] = on_close
+        page.on("close", on_close)
+    
+    def touch(self, session_id: str):
+        """Mark a session as just used."""
+        self.last_used[session_id] = time.monotonic()
+        self.last_used.move_to_end(session_id)
+    
+    def hold(self, session_id: str):
+        """Mark a request as working the session's page, keeping the session from being evicted."""
+        self.in_use[session_id] = self.in_use.get(session_id, 0) + 1
+    
+    def unhold(self, session_id: str):
+        """Undo hold once the request is done with the session's page."""
+        remaining = self.in_use.pop(session_id, 0) - 1
+        if remaining > 0:
+            self.in_use[session_id] = remaining
+    
+    def prefetch(self, session_id: str, url: str):
+        """Start navigating a session's page to url in the background."""
+        self.prefetches[session_id] = asyncio.create_task(prefetch_page(self.pages[session_id], url))
+    
+    async def wait_for_prefetch(self, session_id: str):
+        """Wait for a session's background navigation, if one is still pending."""
+        task = self.prefetches.pop(session_id, None)
+        if task:
+            await task
+    
+    def forget(self, session_id: str, keep_isolated: bool = False) -> Optional[Page]:
+        """
+        Remove a session, returning its page if it had one.
+        
+        With keep_isolated, an isolated session stays known (and still ages out
+        like a live one), so its next request is given a new isolated page.
+        """
+        if not (keep_isolated and session_id in self.isolated_sessions):
+            self.last_used.pop(session_id, None)
+            self.isolated_sessions.discard(session_id)
+        task = self.prefetches.pop(session_id, None)
+        if task:
+            task.cancel()
+        page = self.pages.pop(session_id, None)
+        listener = self.close_listeners.pop(session_id, None)
+        if page and listener:
+            # Pooled pages outlive their sessions, so listeners must not pile up on them
+            page.remove_listener("close", listener)
+        return page
+    
+    async def end_sessions(self, session_ids: List[str]):
+        """Forget the given sessions and release their pages concurrently."""
+        pages = [page for page in map(self.forget, session_ids) if page is not None]
+        results = await asyncio.gather(*(self.release_page(page) for page in pages), return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                logger.warning("Error releasing evicted page: %s", result)
+    
+    async def evict_idle(self, idle_timeout: float) -> int:
+        """End sessions unused for longer than idle_timeout seconds; returns how many were ended."""
+        cutoff = time.monotonic() - idle_timeout
+        # last_used is ordered oldest first, so stop at the first fresh session
+        stale = [
+            session_id for session_id, _ in takewhile(lambda item: item[1] < cutoff, self.last_used.items())
+            if session_id not in self.in_use
+        ]
+        await self.end_sessions(stale)
+        return len(stale)
+    
+    async def enforce_session_limit(self, max_sessions: int = MAX_SESSIONS) -> int:
+        """
+        End the least recently used sessions beyond max_sessions; returns how many were ended.
+        
+        Sessions with a request in flight are skipped, so the limit may be exceeded
+        until a later check once those requests are done.
+        """
+        if max_sessions <= 0 or len(self.last_used) <= max_sessions:
+            return 0
+        idle = (session_id for session_id in self.last_used if session_id not in self.in_use)
+        oldest = list(islice(idle, len(self.last_used) - max_sessions))
+        if not oldest:
+            return 0
+        await self.end_sessions(oldest)
+        logger.info("Session limit %s reached, ended %s least recently used session(s)", max_sessions, len(oldest))
+        return len(oldest)
+    
+    def reset(self):
+        """
+        Drop all session and pool state without closing anything.
+        
+        Used right before the browser is closed, which takes every page and
+        context down with it; cleared sessions keep close listeners from reacting.
+        """
+        for task in (self.refill_task, self.isolated_refill_task, *self.prefetches.values()):
+            if task:
+                task.cancel()
+        self.pages.clear()
+        self.page_pool.clear()
+        self.last_used.clear()
+        self.in_use.clear()
+        self.prefetches.clear()
+        self.close_listeners.clear()
+        self.isolated_contexts.clear()
+        self.isolated_pool.clear()
+        self.isolated_sessions.clear()
 
 
 class BrowserManager:
@@ -107,13 +375,21 @@ class BrowserManager:
     def __init__(self):
         self.playwright: Optional[Playwright] = None
         self.browsers: dict[str, BrowserInfo] = {}
+        # Last use time per browser id, least recently used first
+        self.last_used: OrderedDict[str, float] = OrderedDict()
+        # One lock per browser id serializes its on-demand launch, letting different profiles
+        # launch in parallel; created inside the running loop on first use
+        self._launch_locks: dict[str, asyncio.Lock] = {}
     
     async def start(self, playwright: Playwright):
-        """Initialize the browser manager with playwright instance."""
+        """
+        Initialize the browser manager with playwright instance.
+        
+        The default browser is not launched here but on the first request that
+        needs it, so startup is fast and idle replicas don't hold a Chrome process.
+        """
         self.playwright = playwright
-        # Create default browser
-        await self.create_browser(profile_uid=DEFAULT_BROWSER_ID)
-        logger.info("Browser manager started with default browser")
+        logger.info("Browser manager started")
     
     async def create_browser(
         self, 
@@ -138,8 +414,6 @@ class BrowserManager:
         if profile_uid:
             browser_id = profile_uid
             profile_path = PROFILES_DIR / profile_uid
-            # Ensure no stale locks for this profile if it exists
-            cleanup_profile_locks(profile_path)
             is_persistent = True
         else:
             browser_id = str(uuid.uuid4())
@@ -148,6 +422,11 @@ class BrowserManager:
         
         if browser_id in self.browsers:
             raise ValueError(f"Browser with id '{browser_id}' already exists")
+        
+        if is_persistent:
+            # Ensure no stale locks for this profile if it exists; checked only after the
+            # id is known to be free, so a running browser's locks are never touched
+            await asyncio.to_thread(cleanup_profile_locks, profile_path)
 
         # Proxy configuration
         proxy_config = None
@@ -159,7 +438,7 @@ class BrowserManager:
                 proxy_config["password"] = proxy.password
             if proxy.bypass:
                 proxy_config["bypass"] = proxy.bypass
-            logger.info(f"Browser '{browser_id}' configured with proxy: {proxy.server}")
+            logger.info("Browser '%s' configured with proxy: %s", browser_id, proxy.server)
         
         browser = None
         context = None
@@ -203,101 +482,132 @@ class BrowserManager:
         
         browser_info = BrowserInfo(browser, context, profile_path)
         self.browsers[browser_id] = browser_info
+        self.touch(browser_id)
+        
+        # A persistent context starts with a blank tab already open; pool it rather than leave it idle
+        browser_info.page_pool.extend(page for page in context.pages if not page.is_closed())
+        try:
+            await browser_info.fill_pool()
+        except Exception as e:
+            logger.warning("Failed to prefill page pool for browser '%s': %s", browser_id, e)
         
         if is_persistent:
-            logger.info(f"Created persistent browser '{browser_id}' with profile at {profile_path}")
+            logger.info("Created persistent browser '%s' with profile at %s", browser_id, profile_path)
         else:
-            logger.info(f"Created ephemeral browser '{browser_id}'")
+            logger.info("Created ephemeral browser '%s'", browser_id)
         
+        await self.enforce_browser_limit()
         return browser_id, browser_info
     
     def get_browser(self, browser_id: str) -> BrowserInfo:
         """Get a browser by its ID."""
         if browser_id not in self.browsers:
             raise KeyError(f"Browser with id '{browser_id}' not found")
+        self.touch(browser_id)
         return self.browsers[browser_id]
     
-    def get_default_browser(self) -> BrowserInfo:
-        """Get the default browser."""
-        return self.browsers[DEFAULT_BROWSER_ID]
+    def touch(self, browser_id: str):
+        """Mark a browser as just used."""
+        self.last_used[browser_id] = time.monotonic()
+        self.last_used.move_to_end(browser_id)
     
-    def get_default_browser_id(self) -> str:
-        """Get the default browser ID."""
-        return DEFAULT_BROWSER_ID
+    async def enforce_browser_limit(self, max_browsers: int = MAX_BROWSERS) -> int:
+        """Close the least recently used browsers beyond max_browsers; returns how many were closed."""
+        # The default browser is never closed and doesn't count against the limit
+        others = [browser_id for browser_id in self.last_used if browser_id != DEFAULT_BROWSER_ID]
+        if max_browsers <= 0 or len(others) <= max_browsers:
+            return 0
+        oldest = others[:len(others) - max_browsers]
+        await asyncio.gather(*(self.close_browser(browser_id) for browser_id in oldest), return_exceptions=True)
+        logger.info("Browser limit %s reached, closed %s least recently used browser(s)", max_browsers, len(oldest))
+        return len(oldest)
     
-    async def close_browser(self, browser_id: str) -> bool:
-        """Close and remove a browser instance."""
-        if browser_id == DEFAULT_BROWSER_ID:
-            raise ValueError("Cannot close the default browser")
-        
-        if browser_id not in self.browsers:
-            return False
-        
-        browser_info = self.browsers[browser_id]
+    async def get_or_create_browser(self, browser_id: str) -> BrowserInfo:
+        """Get a browser by its ID, launching it with the persistent profile of that name if needed."""
+        try:
+            return self.get_browser(browser_id)
+        except KeyError:
+            pass
         
-        # Close all pages
-        for page in browser_info.pages.values():
+        lock = self._launch_locks.setdefault(browser_id, asyncio.Lock())
+        async with lock:
+            # Concurrent first requests must not launch the same profile twice
             try:
-                await page.close()
-            except Exception as e:
-                logger.warning(f"Error closing page: {e}")
+                return self.get_browser(browser_id)
+            except KeyError:
+                logger.info("Browser '%s' not found, creating it automatically", browser_id)
+                _, browser_info = await self.create_browser(profile_uid=browser_id)
+                return browser_info
+    
+    async def _close_browser_info(self, browser_id: str, browser_info: BrowserInfo, timeout: Optional[float] = None):
+        """Close a browser, logging failures."""
+        browser_info.reset()
         
-        # Close browser context
+        # Close browser (this properly releases all resources and lock files).
+        # Its contexts and pages, pooled ones included, are closed along with it.
         try:
-            await browser_info.context.close()
+            await asyncio.wait_for(browser_info.browser.close(), timeout=timeout)
+            return
+        except asyncio.TimeoutError:
+            logger.warning("Timeout closing browser %s", browser_id)
         except Exception as e:
-            logger.warning(f"Error closing context: {e}")
+            logger.warning("Error closing browser %s: %s", browser_id, e)
         
-        # Close browser (this properly releases all resources and lock files)
+        # Fall back to closing the context, which also ends a persistent browser
         try:
-            await browser_info.browser.close()
+            await asyncio.wait_for(browser_info.context.close(), timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Timeout closing context for browser %s", browser_id)
         except Exception as e:
-            logger.warning(f"Error closing browser: {e}")
+            logger.warning("Error closing context for browser %s: %s", browser_id, e)
+    
+    async def close_browser(self, browser_id: str) -> bool:
+        """Close and remove a browser instance."""
+        if browser_id == DEFAULT_BROWSER_ID:
+            raise ValueError("Cannot close the default browser")
+        
+        if browser_id not in self.browsers:
+            return False
         
-        del self.browsers[browser_id]
-        logger.info(f"Closed browser '{browser_id}'")
+        browser_info = self.browsers.pop(browser_id)
+        self.last_used.pop(browser_id, None)
+        lock = self._launch_locks.get(browser_id)
+        if lock and not lock.locked():
+            del self._launch_locks[browser_id]
+        await self._close_browser_info(browser_id, browser_info)
+        
+        logger.info("Closed browser '%s'", browser_id)
         return True
     
+    async def evict_idle_sessions(self, idle_timeout: float):
+        """End idle sessions across all browsers."""
+        for browser_id, browser_info in list(self.browsers.items()):
+            evicted = await browser_info.evict_idle(idle_timeout)
+            if evicted:
+                logger.info("Ended %s idle session(s) in browser '%s'", evicted, browser_id)
+    
     async def shutdown(self, timeout: float = 25.0):
         """Close all browsers and cleanup with timeout protection."""
         logger.info("Starting browser shutdown...")
         
         async def _shutdown_task():
-            for browser_id in list(self.browsers.keys()):
-                browser_info = self.browsers[browser_id]
-                
-                # Close all pages first
-                for page in browser_info.pages.values():
-                    try:
-                        await asyncio.wait_for(page.close(), timeout=2.0)
-                    except asyncio.TimeoutError:
-                        logger.warning(f"Timeout closing page, forcing close")
-                    except Exception as e:
-                        logger.warning(f"Error closing page: {e}")
-                
-                # Close browser context
-                try:
-                    await asyncio.wait_for(browser_info.context.close(), timeout=5.0)
-                except asyncio.TimeoutError:
-                    logger.warning(f"Timeout closing context for browser {browser_id}")
-                except Exception as e:
-                    logger.warning(f"Error closing context for browser {browser_id}: {e}")
-                
-                # Close browser (this properly releases all resources and lock files)
-                try:
-                    await asyncio.wait_for(browser_info.browser.close(), timeout=5.0)
-                except asyncio.TimeoutError:
-                    logger.warning(f"Timeout closing browser {browser_id}")
-                except Exception as e:
-                    logger.warning(f"Error closing browser {browser_id}: {e}")
+            # Browsers are independent, so they are closed concurrently
+            await asyncio.gather(
+                *(
+                    self._close_browser_info(browser_id, browser_info, timeout=5.0)
+                    for browser_id, browser_info in list(self.browsers.items())
+                ),
+                return_exceptions=True
+            )
             
             self.browsers.clear()
+            self.last_used.clear()
             logger.info("All browsers closed")
         
         try:
             await asyncio.wait_for(_shutdown_task(), timeout=timeout)
         except asyncio.TimeoutError:
-            logger.error(f"Shutdown timed out after {timeout}s, forcing cleanup")
+            logger.error("Shutdown timed out after %ss, forcing cleanup", timeout)
             self.browsers.clear()
 
 
@@ -305,46 +615,152 @@ class BrowserManager:
 browser_manager = BrowserManager()
 
 
+async def evict_idle_sessions_loop(manager: BrowserManager, idle_timeout: float):
+    """Periodically end sessions that have been idle longer than idle_timeout seconds."""
+    interval = min(idle_timeout, 60.0)
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await manager.evict_idle_sessions(idle_timeout)
+        except Exception as e:
+            logger.warning("Error evicting idle sessions: %s", e)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Clean up Chrome lock files before starting Playwright
     # This ensures a clean state on container restart
-    default_profile = PROFILES_DIR / DEFAULT_BROWSER_ID
-    cleanup_profile_locks(default_profile)
-    default_profile.mkdir(parents=True, exist_ok=True)
+    # (the profile directory itself is created by Playwright when the browser launches)
+    await asyncio.to_thread(cleanup_profile_locks, PROFILES_DIR / DEFAULT_BROWSER_ID)
     
     # Start playwright and browser manager
     playwright = await async_playwright().start()
     try:
         await browser_manager.start(playwright)
     except Exception as e:
-        logger.error(f"Failed to start browser manager: {e}")
+        logger.error("Failed to start browser manager: %s", e)
         # Try to cleanup and re-raise or handle gracefully?
         # For now, we log and continue, but app might be unhealthy
     
     app.state.playwright = playwright
     app.state.browser_manager = browser_manager
+    # Shared client for browserless fetches (light search), reusing connections across requests
+    app.state.http_client = httpx.AsyncClient(headers=LIGHT_SEARCH_HEADERS, follow_redirects=True)
+    # Created here so it binds to the server's event loop
+    app.state.browser_semaphore = asyncio.Semaphore(BROWSER_CONCURRENCY)
+    
+    eviction_task = None
+    if SESSION_IDLE_TIMEOUT > 0:
+        eviction_task = asyncio.create_task(evict_idle_sessions_loop(browser_manager, SESSION_IDLE_TIMEOUT))
     
     yield
     
     # Cleanup: properly close all browsers before stopping Playwright
     logger.info("Application shutting down, cleaning up resources...")
+    if eviction_task:
+        eviction_task.cancel()
+    await app.state.http_client.aclose()
     try:
         await browser_manager.shutdown(timeout=25.0)
     except Exception as e:
-        logger.error(f"Error during browser shutdown: {e}")
+        logger.error("Error during browser shutdown: %s", e)
     
     try:
         await asyncio.wait_for(playwright.stop(), timeout=5.0)
     except asyncio.TimeoutError:
         logger.warning("Timeout stopping playwright, continuing shutdown")
     except Exception as e:
-        logger.warning(f"Error stopping playwright: {e}")
+        logger.warning("Error stopping playwright: %s", e)
     
     logger.info("Shutdown complete")
 
 
-app = FastAPI(title="Controller API", version="0.2.0", lifespan=lifespan, root_path="/parser")
+# Bodies at least this large are compressed in a worker thread instead of on the event loop
+GZIP_THREAD_MIN_SIZE = 64 * 1024
+# Content types that are already compressed, or must reach the client unbuffered
+GZIP_EXCLUDED_TYPES = ("image/", "text/event-stream")
+
+
+class GZipBodyMiddleware:
+    """
+    Gzip response bodies for clients that accept it.
+    
+    Unlike Starlette's GZipMiddleware, large bodies are compressed off the event loop,
+    so a multi-MB page doesn't stall other requests and health checks, and images
+    or bodies that already carry a Content-Encoding are passed through untouched.
+    Level 6 gets nearly all of level 9's savings for a fraction of the CPU.
+    """
+    def __init__(self, app, minimum_size: int = 1024, compresslevel: int = 6):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.compresslevel = compresslevel
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or "gzip" not in Headers(scope=scope).get("accept-encoding", ""):
+            await self.app(scope, receive, send)
+            return
+        
+        start = None
+        passthrough = False
+        compressor = None
+        
+        async def compress(data: bytes, finish: bool) -> bytes:
+            def run() -> bytes:
+                out = compressor.compress(data)
+                return out + compressor.flush() if finish else out
+            if len(data) >= GZIP_THREAD_MIN_SIZE:
+                return await asyncio.to_thread(run)
+            return run()
+        
+        async def send_compressed(message):
+            nonlocal start, passthrough, compressor
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                passthrough = "content-encoding" in headers or headers.get("content-type", "").startswith(GZIP_EXCLUDED_TYPES)
+                if passthrough:
+                    await send(message)
+                else:
+                    # Held back until the first body shows whether compressing is worth it
+                    start = message
+                return
+            if passthrough or message["type"] != "http.response.body":
+                await send(message)
+                return
+            
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if start is not None:
+                headers = MutableHeaders(raw=start["headers"])
+                if not more_body and len(body) < self.minimum_size:
+                    passthrough = True
+                    await send(start)
+                    await send(message)
+                    return
+                headers.add_vary_header("Accept-Encoding")
+                headers["Content-Encoding"] = "gzip"
+                del headers["Content-Length"]
+                compressor = zlib.compressobj(self.compresslevel, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+                body = await compress(body, finish=not more_body)
+                if not more_body:
+                    headers["Content-Length"] = str(len(body))
+                await send(start)
+                start = None
+            else:
+                body = await compress(body, finish=not more_body)
+            await send({"type": "http.response.body", "body": body, "more_body": more_body})
+        
+        await self.app(scope, receive, send_compressed)
+
+
+app = FastAPI(
+    title="Controller API",
+    version="0.2.0",
+    lifespan=lifespan,
+    root_path="/parser",
+    # orjson serializes large HTML/text payloads much faster than the stdlib json module
+    default_response_class=ORJSONResponse
+)
+app.add_middleware(GZipBodyMiddleware, minimum_size=int(os.getenv("GZIP_MINIMUM_SIZE", "1024")))
 
 
 # Request/Response models for browser management
@@ -375,6 +791,14 @@ class BrowserResponse(BaseModel):
 
 class StartSessionRequest(BaseModel):
     browser_id: Optional[str] = Field(default=None, description="Browser to create session in. Defaults to default browser.")
+    url: Optional[str] = Field(
+        default=None,
+        description="URL to start loading in the background, so the session's first request finds it already loaded."
+    )
+    isolated: bool = Field(
+        default=False,
+        description="Open the session in its own browser context, sharing no cookies or storage with the browser's profile or other sessions."
+    )
 
 
 # Dependencies
@@ -382,6 +806,20 @@ BrowserIdDep = Annotated[Optional[str], Header(alias="X-Browser-Id")]
 SessionIdDep = Annotated[Optional[str], Header(alias="X-Session-Id")]
 
 
+async def resolve_browser(manager: BrowserManager, browser_id: Optional[str] = None) -> BrowserInfo:
+    """
+    Get a browser for a request, defaulting to the default browser.
+    
+    A browser that doesn't exist yet is created with the persistent profile of that
+    name; a failed launch is reported as a 500.
+    """
+    bid = browser_id or DEFAULT_BROWSER_ID
+    try:
+        return await manager.get_or_create_browser(bid)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to create browser '{bid}': {str(e)}")
+
+
 async def get_browser_info(
     request: Request,
     browser_id: BrowserIdDep = None
@@ -392,29 +830,17 @@ async def get_browser_info(
     If a specific browser_id is provided and doesn't exist, it will be created automatically.
     If no browser_id is provided, uses the default browser and ensures it exists.
     """
-    manager: BrowserManager = request.app.state.browser_manager
-    bid = browser_id or manager.get_default_browser_id()
-    
-    try:
-        return manager.get_browser(bid)
-    except KeyError:
-        # Browser doesn't exist - create it automatically
-        logger.info(f"Browser '{bid}' not found, creating it automatically")
-        try:
-            # Create the browser with the profile_uid (for persistent profile)
-            _, browser_info = await manager.create_browser(profile_uid=bid)
-            return browser_info
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Failed to create browser '{bid}': {str(e)}")
+    return await resolve_browser(request.app.state.browser_manager, browser_id)
 
 
 BrowserInfoDep = Annotated[BrowserInfo, Depends(get_browser_info)]
 
 
-async def get_or_create_page(
+@asynccontextmanager
+async def session_page(
     request: Request,
-    browser_info: BrowserInfoDep,
-    session_id: SessionIdDep = None
+    browser_info: BrowserInfo,
+    session_id: Optional[str] = None
 ) -> AsyncGenerator[Page, None]:
     """
     Get or create a page object for the given session ID within a browser.
@@ -424,41 +850,74 @@ async def get_or_create_page(
     is_ad_hoc = False
     # Generate session_id if not provided
     if session_id is None:
-        session_id = str(uuid.uuid4())
+        # Never shown to clients, so a cheap random token is enough
+        session_id = secrets.token_urlsafe(16)
         is_ad_hoc = True
         
     request.state.session_id = session_id
     
     pages = browser_info.pages
     page = None
+    # Sessions started isolated stay isolated, even after their page was closed
+    isolated = session_id in browser_info.isolated_sessions
     
     # Check if page already exists
     if session_id in pages:
         page = pages[session_id]
         # Verify page is still valid (not closed)
-        try:
-            _ = page.url
-        except Exception:
-            logger.info(f"Page for session {session_id} was closed, creating new one")
+        if page.is_closed():
+            logger.info("Page for session %s was closed, creating new one", session_id)
+            # Closes the context left behind by an isolated page
+            await browser_info.release_page(page)
             page = None
             
     if page is None:
-        # Create new page
-        page = await browser_info.context.new_page()
-        pages[session_id] = page
-        logger.info(f"Created new page for session {session_id} (ad-hoc={is_ad_hoc})")
+        # Take a warm page from the pool
+        page = await (browser_info.acquire_isolated_page() if isolated else browser_info.acquire_page())
+        browser_info.assign(session_id, page)
+        logger.info("Created new page for session %s (ad-hoc=%s)", session_id, is_ad_hoc)
     
+    if not is_ad_hoc:
+        browser_info.touch(session_id)
+        # Eviction must not reset the page while this request is still working it
+        browser_info.hold(session_id)
     try:
-        yield page
+        if not is_ad_hoc:
+            await browser_info.enforce_session_limit()
+            # Don't race a navigation started by /start_session
+            await browser_info.wait_for_prefetch(session_id)
+        
+        # Bound the number of requests working pages at once
+        semaphore = request.app.state.browser_semaphore
+        await semaphore.acquire()
+        try:
+            yield page
+        finally:
+            semaphore.release()
     finally:
         if is_ad_hoc:
             try:
                 # Remove from pages dict first to prevent race conditions or stale access
-                pages.pop(session_id, None)
-                await page.close()
-                logger.info(f"Closed ad-hoc page for session {session_id}")
+                browser_info.forget(session_id)
+                await browser_info.release_page(page)
+                logger.info("Released ad-hoc page for session %s", session_id)
             except Exception as e:
-                logger.warning(f"Error closing ad-hoc page for session {session_id}: {e}")
+                logger.warning("Error releasing ad-hoc page for session %s: %s", session_id, e)
+        else:
+            browser_info.unhold(session_id)
+            if session_id in pages:
+                # Idle time counts from the end of the last request
+                browser_info.touch(session_id)
+
+
+async def get_or_create_page(
+    request: Request,
+    browser_info: BrowserInfoDep,
+    session_id: SessionIdDep = None
+) -> AsyncGenerator[Page, None]:
+    """Provide the session's page for the duration of a request (see session_page)."""
+    async with session_page(request, browser_info, session_id) as page:
+        yield page
 
 
 PageDep = Annotated[Page, Depends(get_or_create_page)]
@@ -466,10 +925,14 @@ PageDep = Annotated[Page, Depends(get_or_create_page)]
 
 # ==================== Browser Management Endpoints ====================
 
-@app.get("/ping")
-async def root() -> PingResponse:
+# Health checks hit /ping constantly and the body never changes, so it is encoded once
+PING_RESPONSE_BODY = orjson.dumps(PingResponse(status="ok", message="Controller API is running").model_dump())
+
+
+@app.get("/ping", response_model=PingResponse)
+async def root() -> Response:
     """Health check endpoint"""
-    return PingResponse(status="ok", message="Controller API is running")
+    return Response(content=PING_RESPONSE_BODY, media_type="application/json")
 
 
 @app.get("/browsers")
@@ -541,24 +1004,21 @@ async def start_session(
     
     If neither is provided, uses the default browser.
     If the specified browser doesn't exist, it will be created automatically.
+    If url is provided, the page starts loading it in the background right away.
+    With isolated=True the session gets its own browser context, closed when the session ends.
     """
     # Use request body browser_id if header not provided
-    bid = browser_id or request.browser_id or browser_manager.get_default_browser_id()
-    
-    try:
-        browser_info = browser_manager.get_browser(bid)
-    except KeyError:
-        # Browser doesn't exist - create it automatically
-        logger.info(f"Browser '{bid}' not found, creating it automatically")
-        try:
-            _, browser_info = await browser_manager.create_browser(profile_uid=bid)
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Failed to create browser '{bid}': {str(e)}")
+    bid = browser_id or request.browser_id or DEFAULT_BROWSER_ID
+    browser_info = await resolve_browser(browser_manager, bid)
     
     session_id = str(uuid.uuid4())
-    page = await browser_info.context.new_page()
-    browser_info.pages[session_id] = page
-    logger.info(f"Started new session: {session_id} in browser '{bid}'")
+    page = await (browser_info.acquire_isolated_page() if request.isolated else browser_info.acquire_page())
+    browser_info.assign(session_id, page)
+    browser_info.touch(session_id)
+    await browser_info.enforce_session_limit()
+    if request.url:
+        browser_info.prefetch(session_id, request.url)
+    logger.info("Started new session: %s in browser '%s'", session_id, bid)
     
     return {
         "session_id": session_id,
@@ -573,47 +1033,247 @@ async def end_session(
     session_id: SessionIdDep = None
 ) -> dict:
     """
-    End a session and close the page.
+    End a session and return its page to the browser's page pool.
     Requires X-Session-Id header. X-Browser-Id header is optional (defaults to default browser).
     """
     if session_id is None:
         raise HTTPException(status_code=400, detail="X-Session-Id header is required")
     
-    page = browser_info.pages.pop(session_id, None)
+    page = browser_info.forget(session_id)
+    if page and page.is_closed():
+        # Nothing to close for a shared page; an isolated page's context still is
+        await browser_info.release_page(page)
+        return {"status": "success", "message": f"Session {session_id} removed (page was already closed)"}
     if page:
         try:
-            await page.close()
-            logger.info(f"Closed page for session {session_id}")
+            await browser_info.release_page(page)
+            logger.info("Released page for session %s", session_id)
             return {"status": "success", "message": f"Session {session_id} ended"}
         except Exception as e:
-            logger.warning(f"Error closing page for session {session_id}: {e}")
-            return {"status": "success", "message": f"Session {session_id} removed (page was already closed)"}
+            logger.warning("Error closing page for session %s: %s", session_id, e)
+            return {"status": "success", "message": f"Session {session_id} removed (page could not be closed)"}
     else:
         return {"status": "success", "message": f"Session {session_id} not found (already ended or never existed)"}
 
 
+# ==================== In-Page Helpers ====================
+
+# Helper library installed lazily into the page, once per document.
+# Patchright evaluates in an isolated world, which can't see init scripts added to the
+# main world, so the library installs itself on first use and is reached through
+# CALL_PAGE_HELPER_JS afterwards. Called as ([name, arg]) => result.
+PAGE_HELPERS_JS = """
+([name, arg]) => {
+    // Compiled XPath expressions are cached for the lifetime of the document
+    const xpCache = new Map();
+    const xpathNodes = (xpath) => {
+        let expression = xpCache.get(xpath);
+        if (!expression) {
+            if (xpCache.size >= 256) xpCache.clear();
+            expression = document.createExpression(xpath);
+            xpCache.set(xpath, expression);
+        }
+        const snapshot = expression.evaluate(document, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+        const nodes = [];
+        for (let i = 0; i < snapshot.snapshotLength; i++) {
+            nodes.push(snapshot.snapshotItem(i));
+        }
+        return nodes;
+    };
+    const nodeValue = (node) => node.nodeValue || node.textContent || '';
+    // CSS matches inside open shadow roots too, like Playwright's css engine. Hosts are
+    // found with one walk over the whole tree, so the roots are collected once per helper call
+    let shadowRoots = null;
+    const collectShadowRoots = (root, roots) => {
+        for (const el of root.querySelectorAll('*')) {
+            if (el.shadowRoot) {
+                roots.push(el.shadowRoot);
+                collectShadowRoots(el.shadowRoot, roots);
+            }
+        }
+        return roots;
+    };
+    const cssNodes = (css) => {
+        shadowRoots = shadowRoots || collectShadowRoots(document, []);
+        const nodes = Array.from(document.querySelectorAll(css));
+        for (const root of shadowRoots) nodes.push(...root.querySelectorAll(css));
+        return nodes;
+    };
+
+    // Runs a list of read-only selector actions in one round-trip.
+    // Each entry resolves independently, so a failing selector only reports its own error.
+    // Lookup tables keyed by selector type and action, built once per document
+    const finders = {
+        css: cssNodes,
+        xml: xpathNodes
+    };
+    // Optional per-selector length cap, applied before values leave the page
+    const clip = (value, max) => max && value.length > max ? value.slice(0, max) : value;
+    const extractors = {
+        html: (el, entry) => clip(el.outerHTML, entry.max),
+        text: (el, entry) => clip(el.innerText, entry.max),
+        attribute: (el, entry) => el.getAttribute(entry.name) || ''
+    };
+    const readEntry = (entry) => {
+        try {
+            const nodes = finders[entry.type](entry.value);
+
+            if (entry.action === 'attribute' && entry.direct) {
+                return {values: nodes.map(nodeValue)};
+            }
+
+            const extract = extractors[entry.action];
+            const values = [];
+            for (const node of nodes) {
+                if (node.nodeType === Node.ELEMENT_NODE) values.push(extract(node, entry));
+            }
+            return {values};
+        } catch (e) {
+            return {error: String(e)};
+        }
+    };
+
+    // The DOM may change between calls, so every call starts without collected roots
+    const fresh = (helper) => (arg) => {
+        shadowRoots = null;
+        return helper(arg);
+    };
+
+    globalThis.__lb = {
+        readBatch: fresh((entries) => entries.map(readEntry)),
+        xpathValues: (xpath) => xpathNodes(xpath).map(nodeValue),
+        cssAttribute: fresh(([css, attr]) => cssNodes(css).map(el => el.getAttribute(attr) || ''))
+    };
+    return globalThis.__lb[name](arg);
+}
+"""
+
+# Calls an installed helper; returns null when the current document doesn't have them yet
+CALL_PAGE_HELPER_JS = "([name, arg]) => globalThis.__lb ? globalThis.__lb[name](arg) : null"
+
+
+async def call_page_helper(page: Page, name: str, arg, fresh_document: bool = False):
+    """
+    Call a helper from PAGE_HELPERS_JS on the page.
+    
+    Only the short trampoline is sent while the helpers are installed; the full
+    library is sent when the document doesn't have them yet. Pass fresh_document=True
+    right after a navigation to go straight to the install path.
+    """
+    if not fresh_document:
+        result = await page.evaluate(CALL_PAGE_HELPER_JS, [name, arg])
+        if result is not None:
+            return result
+    return await page.evaluate(PAGE_HELPERS_JS, [name, arg])
+
+
 # ==================== Helper Functions for Native Playwright ====================
 
-def build_locator(page: Page, selector_type: str, selector_value: str):
-    """Build a Playwright locator from selector type and value."""
-    if selector_type == "css":
-        return page.locator(selector_value)
-    else:  # xml/xpath
-        return page.locator(f"xpath={selector_value}")
+async def wait_for_idle(page: Page, idle: float):
+    """
+    Wait for the page network to go idle, for at most `idle` seconds.
+    
+    Returns as soon as the page settles instead of always sleeping the full budget.
+    """
+    if idle <= 0:
+        return
+    try:
+        await page.wait_for_load_state("networkidle", timeout=idle * 1000)
+    except PlaywrightTimeoutError:
+        pass
+
+
+async def ensure_at(page: Page, url: Optional[str], wait_until: str, timeout: float, force_reload: bool = False) -> bool:
+    """
+    Navigate to url unless the page is already there.
+    
+    Returns True if a navigation happened. force_reload navigates even when the
+    page is already at url; a missing url never navigates.
+    """
+    if not url or (page.url == url and not force_reload):
+        return False
+    await page.goto(url, wait_until=wait_until, timeout=timeout)
+    return True
+
+
+# CDP sessions opened on pages, reused for as long as each page lives
+cdp_sessions: "weakref.WeakKeyDictionary[Page, CDPSession]" = weakref.WeakKeyDictionary()
+
+
+async def get_cdp_session(page: Page) -> CDPSession:
+    """Get the page's CDP session, opening it on first use."""
+    session = cdp_sessions.get(page)
+    if session is None:
+        session = await page.context.new_cdp_session(page)
+        cdp_sessions[page] = session
+    return session
+
+
+async def capture_screenshot(page: Page, format: str = "png", quality: int = 80, full_page: bool = False) -> bytes:
+    """
+    Take a screenshot over CDP.
+    
+    page.screenshot can't produce WebP, and for PNG it uses the default zlib level,
+    which makes encoding the bulk of the cost of a large screenshot; optimizeForSpeed
+    trades a somewhat larger file for a much cheaper encode.
+    Full-page captures render beyond the viewport in place, instead of resizing
+    the viewport to the document and back the way page.screenshot does.
+    """
+    cdp = await get_cdp_session(page)
+    params = {"format": format, "optimizeForSpeed": True}
+    if format != "png":
+        params["quality"] = quality
+    if full_page:
+        metrics = await cdp.send("Page.getLayoutMetrics")
+        size = metrics.get("cssContentSize") or metrics["contentSize"]
+        params["captureBeyondViewport"] = True
+        params["clip"] = {"x": 0, "y": 0, "width": size["width"], "height": size["height"], "scale": 1}
+    result = await cdp.send("Page.captureScreenshot", params)
+    return base64.b64decode(result["data"])
+
+
+# Recompressing a large PNG takes a while, so it runs off the event loop in its own
+# pool rather than the default executor other blocking calls share
+png_optimize_pool = ThreadPoolExecutor(max_workers=os.cpu_count() or 1, thread_name_prefix="oxipng")
+
+
+async def optimize_png(data: bytes) -> bytes:
+    """Losslessly recompress a PNG, stripping only chunks that don't affect rendering."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        png_optimize_pool,
+        lambda: oxipng.optimize_from_memory(data, level=2, strip=oxipng.StripChunks.safe())
+    )
+
+
+# Locators built per page, reused while the page lives; scraping loops repeat the same selectors
+locator_caches: "weakref.WeakKeyDictionary[Page, OrderedDict[tuple[str, str], Locator]]" = weakref.WeakKeyDictionary()
+LOCATOR_CACHE_SIZE = 128
+
+
+def build_locator(page: Page, selector_type: str, selector_value: str) -> Locator:
+    """Build a Playwright locator from selector type and value, reusing one built earlier for the page."""
+    cache = locator_caches.get(page)
+    if cache is None:
+        cache = locator_caches[page] = OrderedDict()
+    key = (selector_type, selector_value)
+    locator = cache.get(key)
+    if locator is None:
+        if selector_type == "css":
+            locator = page.locator(selector_value)
+        else:  # xml/xpath
+            locator = page.locator(f"xpath={selector_value}")
+        cache[key] = locator
+        if len(cache) > LOCATOR_CACHE_SIZE:
+            cache.popitem(last=False)
+    return locator
 
 
 async def get_elements_html(page: Page, selector_type: str, selector_value: str) -> List[str]:
     """Get outer HTML of all matching elements using native Playwright."""
     locator = build_locator(page, selector_type, selector_value)
-    count = await locator.count()
-    results = []
-    for i in range(count):
-        try:
-            html = await locator.nth(i).evaluate("el => el.outerHTML")
-            results.append(html)
-        except Exception as e:
-            results.append(f"error: {str(e)}")
-    return results
+    # One round-trip for all matches instead of one per element
+    return await locator.evaluate_all("els => els.map(el => el.outerHTML)")
 
 
 async def get_elements_text(page: Page, selector_type: str, selector_value: str) -> List[str]:
@@ -622,33 +1282,27 @@ async def get_elements_text(page: Page, selector_type: str, selector_value: str)
     return await locator.all_inner_texts()
 
 
+def nth_targets(locator, count: int, nth: Optional[int]) -> list:
+    """
+    Pick the locators an nth-aware action applies to.
+    
+    nth=None selects all matches; any other value selects one match, with negative
+    values counting from the end (-1 is last). Out-of-range indices select nothing.
+    """
+    if nth is None:
+        return [locator.nth(i) for i in range(count)]
+    return [locator.nth(nth)] if -count <= nth < count else []
+
+
 async def click_elements(page: Page, selector_type: str, selector_value: str, nth: Optional[int] = 0) -> List[str]:
     """Click on elements. nth=0 first, nth=-1 last, nth=None all."""
     locator = build_locator(page, selector_type, selector_value)
     count = await locator.count()
-    if count == 0:
-        return []
     
     results = []
-    if nth is None:
-        # Click all
-        for i in range(count):
-            try:
-                await locator.nth(i).click()
-                results.append("clicked")
-            except Exception as e:
-                results.append(f"error: {str(e)}")
-    elif nth == -1:
-        # Click last
-        try:
-            await locator.last.click()
-            results.append("clicked")
-        except Exception as e:
-            results.append(f"error: {str(e)}")
-    else:
-        # Click nth (default 0 = first)
+    for target in nth_targets(locator, count, nth):
         try:
-            await locator.nth(nth).click()
+            await target.click()
             results.append("clicked")
         except Exception as e:
             results.append(f"error: {str(e)}")
@@ -659,166 +1313,313 @@ async def fill_elements(page: Page, selector_type: str, selector_value: str, val
     """Fill elements with value. nth=0 first, nth=-1 last, nth=None all."""
     locator = build_locator(page, selector_type, selector_value)
     count = await locator.count()
-    if count == 0:
-        return []
     
     results = []
-    if nth is None:
-        # Fill all
-        for i in range(count):
-            try:
-                await locator.nth(i).fill(value)
-                results.append("filled")
-            except Exception as e:
-                results.append(f"error: {str(e)}")
-    elif nth == -1:
-        # Fill last
-        try:
-            await locator.last.fill(value)
-            results.append("filled")
-        except Exception as e:
-            results.append(f"error: {str(e)}")
-    else:
-        # Fill nth (default 0 = first)
+    for target in nth_targets(locator, count, nth):
         try:
-            await locator.nth(nth).fill(value)
+            await target.fill(value)
             results.append("filled")
         except Exception as e:
             results.append(f"error: {str(e)}")
     return results
 
 
+# Matches trivial attribute XPaths like //a/@href that can be answered with a CSS query
+SIMPLE_XPATH_ATTRIBUTE = re.compile(r"^//([A-Za-z][\w-]*)/@([A-Za-z_][\w-]*)$")
+
+
+@lru_cache(maxsize=256)
+def simple_xpath_attribute(selector_value: str) -> Optional[tuple[str, str]]:
+    """Return (css_selector, attribute) for a //tag/@attr XPath, or None for anything more complex."""
+    match = SIMPLE_XPATH_ATTRIBUTE.match(selector_value)
+    if not match:
+        return None
+    tag, attr = match.groups()
+    return f"{tag}[{attr}]", attr
+
+
 async def get_elements_attribute(page: Page, selector_type: str, selector_value: str, attr_name: str) -> List[str]:
     """Get attribute value from all matching elements."""
     # Handle direct XPath attribute syntax like //a/@href
     if selector_type == "xml" and "/@" in selector_value:
-        # Use evaluate for direct attribute XPath
-        result = await page.evaluate("""
-            (xpath) => {
-                const result = document.evaluate(xpath, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
-                const values = [];
-                for (let i = 0; i < result.snapshotLength; i++) {
-                    const node = result.snapshotItem(i);
-                    values.push(node.nodeValue || node.textContent || '');
-                }
-                return values;
-            }
-        """, selector_value)
-        return result
+        simple = simple_xpath_attribute(selector_value)
+        if simple:
+            # Plain DOM query avoids the XPath engine entirely
+            return await call_page_helper(page, "cssAttribute", list(simple))
+        return await call_page_helper(page, "xpathValues", selector_value)
     
     locator = build_locator(page, selector_type, selector_value)
-    count = await locator.count()
-    results = []
-    for i in range(count):
-        try:
-            val = await locator.nth(i).get_attribute(attr_name)
-            results.append(val or "")
-        except Exception as e:
-            results.append(f"error: {str(e)}")
-    return results
+    return await locator.evaluate_all("(els, name) => els.map(el => el.getAttribute(name) || '')", attr_name)
+
+
+# Removes all matched elements (nth=null) or the nth one, negative nth counting from the end
+REMOVE_ELEMENTS_JS = """
+(els, nth) => {
+    if (nth === null) {
+        els.forEach(el => el.remove());
+        return els.length;
+    }
+    const el = els[nth < 0 ? els.length + nth : nth];
+    if (!el) return 0;
+    el.remove();
+    return 1;
+}
+"""
 
 
 async def remove_elements(page: Page, selector_type: str, selector_value: str, nth: Optional[int] = 0) -> List[str]:
     """Remove elements from DOM. nth=0 first, nth=-1 last, nth=None all."""
     locator = build_locator(page, selector_type, selector_value)
-    count = await locator.count()
-    if count == 0:
+    # Removal needs no actionability checks, so it resolves and removes the
+    # targets in a single round-trip instead of counting matches first
+    removed = await locator.evaluate_all(REMOVE_ELEMENTS_JS, nth)
+    return ["removed"] * removed
+
+
+# ==================== Batched Selector Reads ====================
+
+# Read-only selector actions that can be resolved in a single page.evaluate call
+READ_ONLY_ACTIONS = (HtmlAction, TextAction, AttributeAction)
+
+def _batch_entry(selector: Selector, action: Action) -> dict:
+    """Build the JSON-serializable description of a read-only action for the readBatch helper."""
+    entry = {"type": selector.type, "value": selector.value, "action": action.action}
+    if selector.max_length and isinstance(action, (HtmlAction, TextAction)):
+        entry["max"] = selector.max_length
+    if isinstance(action, AttributeAction):
+        entry["name"] = action.name
+        # Handle direct XPath attribute syntax like //a/@href
+        entry["direct"] = selector.type == "xml" and "/@" in selector.value
+        simple = simple_xpath_attribute(selector.value) if entry["direct"] else None
+        if simple:
+            entry.update(type="css", value=simple[0], name=simple[1], direct=False)
+    return entry
+
+
+def clip_values(values: List[str], max_length: Optional[int]) -> List[str]:
+    """Truncate each value to max_length characters, mirroring the in-page clip."""
+    if not max_length:
+        return values
+    return [value[:max_length] for value in values]
+
+
+async def _read_html(page: Page, selector: Selector, action: HtmlAction) -> List[str]:
+    return clip_values(await get_elements_html(page, selector.type, selector.value), selector.max_length)
+
+
+async def _read_text(page: Page, selector: Selector, action: TextAction) -> List[str]:
+    return clip_values(await get_elements_text(page, selector.type, selector.value), selector.max_length)
+
+
+async def _click(page: Page, selector: Selector, action: ClickAction) -> List[str]:
+    return await click_elements(page, selector.type, selector.value, action.nth)
+
+
+async def _fill(page: Page, selector: Selector, action: FillAction) -> List[str]:
+    return await fill_elements(page, selector.type, selector.value, action.value, action.nth)
+
+
+async def _read_attribute(page: Page, selector: Selector, action: AttributeAction) -> List[str]:
+    return await get_elements_attribute(page, selector.type, selector.value, action.name)
+
+
+async def _remove(page: Page, selector: Selector, action: RemoveAction) -> List[str]:
+    return await remove_elements(page, selector.type, selector.value, action.nth)
+
+
+# Locator-based handler for each selector action model, looked up by exact type
+SELECTOR_ACTION_HANDLERS: dict[type, Callable[[Page, Selector, Any], Awaitable[List[str]]]] = {
+    HtmlAction: _read_html,
+    TextAction: _read_text,
+    ClickAction: _click,
+    FillAction: _fill,
+    AttributeAction: _read_attribute,
+    RemoveAction: _remove,
+}
+
+
+async def run_selector_action(page: Page, selector: Selector, action: Action) -> List[str]:
+    """Run a single selector action using native Playwright locators."""
+    handler = SELECTOR_ACTION_HANDLERS.get(type(action))
+    if handler is None:
         return []
+    return await handler(page, selector, action)
+
+
+async def read_selectors_batch(
+    page: Page,
+    items: List[tuple[Selector, Action]],
+    fresh_document: bool = False
+) -> List[Union[List[str], Exception]]:
+    """
+    Run read-only selector actions in a single page.evaluate call.
     
-    results = []
-    if nth is None:
-        # Remove all (in reverse order to avoid index shifting)
-        for i in range(count - 1, -1, -1):
-            try:
-                await locator.nth(i).evaluate("el => el.remove()")
-                results.append("removed")
-            except Exception as e:
-                results.append(f"error: {str(e)}")
-        results.reverse()  # Return in original order
-    elif nth == -1:
-        # Remove last
-        try:
-            await locator.last.evaluate("el => el.remove()")
-            results.append("removed")
-        except Exception as e:
-            results.append(f"error: {str(e)}")
+    Entries the in-page query could not handle (e.g. Playwright-specific selector
+    syntax such as :has-text()) fall back to native Playwright locators.
+    Pass fresh_document=True right after a navigation to skip the helper probe.
+    
+    Returns:
+        One entry per item: the list of values, or the exception raised for it
+    """
+    if not items:
+        return []
+    
+    raw_outcomes = await call_page_helper(
+        page, "readBatch", [_batch_entry(s, a) for s, a in items], fresh_document=fresh_document
+    )
+    
+    outcomes: List[Union[List[str], Exception, None]] = [None] * len(items)
+    fallback = []
+    for i, (selector, action) in enumerate(items):
+        outcome = raw_outcomes[i] if i < len(raw_outcomes) else None
+        if isinstance(outcome, dict) and "values" in outcome:
+            outcomes[i] = outcome["values"]
+            continue
+        
+        if isinstance(outcome, dict) and "error" in outcome:
+            logger.info("Batched %s failed for selector %s (%s), using locator", action.action, selector.name, outcome["error"])
+        fallback.append(i)
+    
+    # Fallback reads are independent of each other, so their round-trips can overlap
+    fallback_outcomes = await asyncio.gather(
+        *(run_selector_action(page, *items[i]) for i in fallback),
+        return_exceptions=True
+    )
+    for i, outcome in zip(fallback, fallback_outcomes):
+        outcomes[i] = outcome
+    return outcomes
+
+
+def log_selector_action(selector: Selector, action: Action, values: List[str]):
+    """Log the outcome of a selector action."""
+    # Runs for every action, so skip building the message when INFO is filtered out
+    if not logger.isEnabledFor(logging.INFO):
+        return
+    if isinstance(action, HtmlAction):
+        logger.info("Got %d HTML elements for selector %s", len(values), selector.name)
+    elif isinstance(action, TextAction):
+        logger.info("Got %d text values for selector %s", len(values), selector.name)
+    elif isinstance(action, AttributeAction):
+        logger.info("Got %d attribute values for selector %s", len(values), selector.name)
     else:
-        # Remove nth (default 0 = first)
-        try:
-            await locator.nth(nth).evaluate("el => el.remove()")
-            results.append("removed")
-        except Exception as e:
-            results.append(f"error: {str(e)}")
-    return results
+        nth_desc = "first" if action.nth == 0 else ("last" if action.nth == -1 else "all")
+        verb = {"click": "Clicked", "fill": "Filled", "remove": "Removed"}[action.action]
+        logger.info("%s %d elements (%s) for selector %s", verb, len(values), nth_desc, selector.name)
 
 
 # ==================== Core Endpoints ====================
 
-async def _extract_rating(result_div: ElementHandle) -> Optional[RatingMetadata]:
-    """Extract rating metadata from search result."""
-    try:
-        # User instruction: Use div[data-sncf="2"] as the container
-        rating_container = await result_div.query_selector('div[data-sncf="2"]')
-        if not rating_container:
-            return None
-            
-        # Extract description from aria-label if available
-        # Usually found on a child element (like span.Y0A0hc)
-        description = None
-        labeled_element = await rating_container.query_selector('[aria-label]')
-        if labeled_element:
-            description = await labeled_element.get_attribute('aria-label')
-
-        # Get all spans with aria-hidden="true"
-        # User logic: first is rating, second is reviews
-        spans = await rating_container.query_selector_all('span[aria-hidden="true"]')
-        
-        valid_texts = []
-        for span in spans:
-            text = await span.inner_text()
-            text = text.strip()
-            if text:
-                valid_texts.append(text)
-        
-        rating = None
-        reviews = None
-        
-        if len(valid_texts) >= 1:
-            # Parse rating: "4,8" or "4.8"
-            try:
-                rating_text = valid_texts[0].replace(',', '.')
-                rating = float(rating_text)
-            except ValueError:
-                pass
-                
-        if len(valid_texts) >= 2:
-            # Parse reviews: "(16 492)" or "16,492"
-            try:
-                reviews_text = valid_texts[1]
-                # Filter only digits to handle spaces, parens, nbsp, etc.
-                digits = "".join(c for c in reviews_text if c.isdigit())
-                if digits:
-                    reviews = int(digits)
-            except ValueError:
-                pass
-        
-        if rating is None and reviews is None:
-            return None
-            
-        return RatingMetadata(
-            rating=rating,
-            reviews=reviews,
-            description=description
-        )
+# Container of a single Google search result
+SEARCH_RESULT_SELECTOR = "div[data-rpos]"
+
+# Extracts raw search result data from a Google results page in a single round-trip.
+# Parsing of rating values is left to Python to keep number handling consistent.
+SEARCH_RESULTS_JS = """
+(divs, [limit, seenLinks]) => {
+    // Stop once enough new results are found and skip links collected on earlier
+    // pages, so discarded results (and their base64 images) are never serialized
+    const seen = new Set(seenLinks);
+    const results = [];
+    for (const div of divs) {
+        if (results.length >= limit) break;
+        try {
+            const spans = Array.from(div.querySelectorAll('span'));
+            let link = null;
+            for (const span of spans) {
+                link = span.querySelector('a');
+                if (link) break;
+            }
+            if (!link) continue;
+
+            const href = link.getAttribute('href');
+            if (!href || seen.has(href)) continue;
+            seen.add(href);
+
+            // Checking for an <em> child avoids serializing every span's innerHTML
+            const snippet = spans
+                .filter(span => span.querySelector('em') !== null)
+                .map(span => span.innerText)
+                .join('\\n');
+
+            // Only the favicon and thumbnail (first two inline images) are used
+            const images = Array.from(div.querySelectorAll('img'))
+                .map(img => img.getAttribute('src'))
+                .filter(src => src && src.startsWith('data:image/'))
+                .slice(0, 2);
+
+            let rating = null;
+            const ratingContainer = div.querySelector('div[data-sncf="2"]');
+            if (ratingContainer) {
+                const labeled = ratingContainer.querySelector('[aria-label]');
+                rating = {
+                    description: labeled ? labeled.getAttribute('aria-label') : null,
+                    texts: Array.from(ratingContainer.querySelectorAll('span[aria-hidden="true"]'))
+                        .map(span => span.innerText.trim())
+                        .filter(text => text)
+                };
+            }
+
+            results.push({
+                link: href,
+                title: link.innerText,
+                snippet: snippet,
+                images: images,
+                rating: rating
+            });
+        } catch (e) {
+            continue;
+        }
+    }
+    return results;
+}
+"""
+
+
+def _parse_rating(raw_rating: Optional[dict]) -> Optional[RatingMetadata]:
+    """Build rating metadata from the raw rating data extracted in the page."""
+    if not raw_rating:
+        return None
 
-    except Exception:
+    # User logic: first text is rating, second is reviews
+    valid_texts = raw_rating.get("texts") or []
+
+    rating = None
+    reviews = None
+
+    if len(valid_texts) >= 1:
+        # Parse rating: "4,8" or "4.8"
+        try:
+            rating_text = valid_texts[0].replace(',', '.')
+            rating = float(rating_text)
+        except ValueError:
+            pass
+
+    if len(valid_texts) >= 2:
+        # Parse reviews: "(16 492)" or "16,492"
+        # Filter only digits to handle spaces, parens, nbsp, etc.
+        digits = "".join(c for c in valid_texts[1] if c.isdigit())
+        if digits:
+            reviews = int(digits)
+
+    if rating is None and reviews is None:
         return None
 
+    return RatingMetadata(
+        rating=rating,
+        reviews=reviews,
+        description=raw_rating.get("description")
+    )
+
 
 async def _parse_search_results(page: Page, results: List[SearchResult], seen_links: set, count: int) -> List[SearchResult]:
     """
     Parse search results from the current Google search page.
     
+    All result data is extracted in a single evaluate_all call over the result
+    containers instead of querying every result element through separate
+    Playwright round-trips.
+    The page only returns as many unseen results as are still needed.
+    
     Args:
         page: The browser page with Google search results
         results: Existing results list to append to
@@ -828,69 +1629,33 @@ async def _parse_search_results(page: Page, results: List[SearchResult], seen_li
     Returns:
         Updated list of SearchResult objects
     """
-    result_divs = await page.query_selector_all('div[data-rpos]')
-    
-    for result_div in result_divs:
+    raw_results = await page.locator(SEARCH_RESULT_SELECTOR).evaluate_all(
+        SEARCH_RESULTS_JS, [count - len(results), list(seen_links)]
+    )
+    return _build_search_results(raw_results, results, seen_links, count)
+
+
+def _build_search_results(raw_results: List[dict], results: List[SearchResult], seen_links: set, count: int) -> List[SearchResult]:
+    """Append SearchResult objects built from raw result data, skipping seen links."""
+    for raw in raw_results:
         if len(results) >= count:
             break
             
         try:
-            span_elements = await result_div.query_selector_all('span')
-            link_element = None
-            for span in span_elements:
-                a = await span.query_selector('a')
-                if a:
-                    link_element = a
-                    break
-
-            if not link_element:
-                continue
-
-            href = await link_element.get_attribute('href')
+            href = raw["link"]
             
             # Skip if we've already seen this link
             if href in seen_links:
                 continue
             seen_links.add(href)
-            
-            title = await link_element.inner_text()
-
-            snippet_texts = []
-            for span in span_elements:
-                html = await span.inner_html()
-                if '<em>' in html:
-                    text = await span.inner_text()
-                    snippet_texts.append(text)
 
-            snippet = '\n'.join(snippet_texts)
-
-            # Try to extract images (favicon and thumbnail)
-            favicon_data = None
-            thumbnail_data = None
-            
-            try:
-                # Find all images in the result div
-                images = await result_div.query_selector_all('img')
-                
-                valid_images = []
-                for img in images:
-                    src = await img.get_attribute('src')
-                    if src and src.startswith('data:image/'):
-                        valid_images.append(src)
-                
-                if valid_images:
-                    # First image is favicon
-                    favicon_data = valid_images[0]
-                    
-                    # Second image (if exists) is thumbnail
-                    if len(valid_images) > 1:
-                        thumbnail_data = valid_images[1]
-                        
-            except Exception:
-                pass  # Skip if image extraction fails
+            # First image is favicon, second image (if exists) is thumbnail
+            images = raw.get("images") or []
+            favicon_data = images[0] if images else None
+            thumbnail_data = images[1] if len(images) > 1 else None
 
             # Extract rating metadata
-            rating_metadata = await _extract_rating(result_div)
+            rating_metadata = _parse_rating(raw.get("rating"))
             
             # Construct metadata object if we have rating or thumbnail
             metadata = None
@@ -902,8 +1667,8 @@ async def _parse_search_results(page: Page, results: List[SearchResult], seen_li
 
             results.append(SearchResult(
                 link=href,
-                title=title,
-                snippet=snippet,
+                title=raw["title"],
+                snippet=raw["snippet"],
                 favicon=favicon_data,
                 metadata=metadata
             ))
@@ -914,21 +1679,103 @@ async def _parse_search_results(page: Page, results: List[SearchResult], seen_li
     return results
 
 
-@app.post("/search")
-async def search(request: SearchRequest, page: PageDep) -> List[SearchResult]:
+# Browser-like headers for fetching Google results without a browser
+LIGHT_SEARCH_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+
+
+def _extract_search_results(html: str, limit: int) -> List[dict]:
     """
-    Search the web using Google and return search results
+    Extract raw search result data from Google results HTML.
     
-    Args:
-        request: SearchRequest with query string and count of results
-        page: Page object automatically managed by session (via X-Session-Id header)
-        
-    Returns:
-        List[SearchResult]: Array of search results with link, title, and snippet
+    Mirrors SEARCH_RESULTS_JS so both search paths feed the same result building.
+    """
+    results = []
+    seen = set()
+    for div in LexborHTMLParser(html).css(SEARCH_RESULT_SELECTOR):
+        if len(results) >= limit:
+            break
+        spans = div.css("span")
+        link = next((a for a in (span.css_first("a") for span in spans) if a is not None), None)
+        if link is None:
+            continue
+
+        href = link.attributes.get("href")
+        if not href or href in seen:
+            continue
+        seen.add(href)
+
+        snippet = "\n".join(span.text() for span in spans if span.css_first("em") is not None)
+        images = [
+            src for src in (img.attributes.get("src") for img in div.css("img"))
+            if src and src.startswith("data:image/")
+        ][:2]
+
+        rating = None
+        rating_container = div.css_first('div[data-sncf="2"]')
+        if rating_container is not None:
+            labeled = rating_container.css_first("[aria-label]")
+            rating = {
+                "description": labeled.attributes.get("aria-label") if labeled is not None else None,
+                "texts": [
+                    text for text in (span.text().strip() for span in rating_container.css('span[aria-hidden="true"]'))
+                    if text
+                ]
+            }
+
+        results.append({
+            "link": href,
+            "title": link.text(),
+            "snippet": snippet,
+            "images": images,
+            "rating": rating
+        })
+    return results
+
+
+async def google_search_light(client: httpx.AsyncClient, query: str, count: int, timeout: float) -> Optional[List[SearchResult]]:
+    """
+    Fetch and parse Google results over plain HTTP, without a browser page.
+    
+    Returns None when Google rate-limits the request, serves a challenge page
+    or returns no parsable results, so the caller can fall back to the browser.
     """
+    try:
+        response = await client.get(
+            "https://www.google.com/search",
+            params={"q": query, "num": count},
+            timeout=timeout / 1000
+        )
+    except httpx.HTTPError as e:
+        logger.info("Light search request failed for query %s: %s", query, e)
+        return None
+
+    # 429 and the /sorry/ captcha redirect are Google's rate-limit responses
+    if response.status_code != 200 or response.url.path.startswith("/sorry/"):
+        logger.info("Light search blocked (%s) for query: %s", response.status_code, query)
+        return None
+
+    results = _build_search_results(_extract_search_results(response.text, count), [], set(), count)
+    return results or None
+
+
+# Google's "Next" pagination link: id="pnnext", the aria-label variant, or by text in the pagination table
+NEXT_PAGE_SELECTOR = 'a#pnnext, a[aria-label="Next page"], table.AaVjTc a:has-text("Next")'
+
+
+async def google_search_browser(page: Page, request: SearchRequest) -> List[SearchResult]:
+    """Run a Google search in a browser page, following pagination until enough results are collected."""
     try:
         await page.goto(f"https://www.google.com/search?q={request.query}&num={request.count}", wait_until="commit")
-        await asyncio.sleep(3)
+        try:
+            # Parse as soon as the first result is in the DOM
+            await page.wait_for_selector(SEARCH_RESULT_SELECTOR, state="attached", timeout=request.timeout)
+        except PlaywrightTimeoutError:
+            logger.info("No search results appeared within %sms for query: %s", request.timeout, request.query)
+            return []
 
         results = []
         seen_links = set()  # Track seen links to avoid duplicates across pages
@@ -941,27 +1788,23 @@ async def search(request: SearchRequest, page: PageDep) -> List[SearchResult]:
         current_page = 1
         
         while len(results) < request.count and current_page < max_pages:
-            # Try to find and click the next page button
-            # Google uses id="pnnext" for the "Next" link
-            next_button = await page.query_selector('a#pnnext')
-            
-            if not next_button:
-                # Try alternative selectors for next page
-                logger.info("No next page button found. Trying alternative selectors: 'aria-label' method")
-                next_button = await page.query_selector('a[aria-label="Next page"]')
-            if not next_button:
-                # Try finding by text content in pagination
-                logger.info("No next page button found. Trying alternative selectors: 'next' text method")
-                next_button = await page.query_selector('table.AaVjTc a:has-text("Next")')
+            # Try to find and click the next page button, all variants in one query
+            next_button = await page.query_selector(NEXT_PAGE_SELECTOR)
             
             if not next_button:
                 # No more pages available
-                logger.info(f"No next page button found after page {current_page}. Got {len(results)} results.")
+                logger.info("No next page button found after page %s. Got %s results.", current_page, len(results))
                 break
             
-            # Click next page
+            # Click next page and wait for its results instead of a fixed delay
+            previous_url = page.url
             await next_button.click()
-            await asyncio.sleep(1)  # Wait for page to load
+            try:
+                await page.wait_for_url(lambda url: url != previous_url, wait_until="commit", timeout=request.timeout)
+                await page.wait_for_selector(SEARCH_RESULT_SELECTOR, state="attached", timeout=request.timeout)
+            except PlaywrightTimeoutError:
+                logger.info("Next page results did not appear within %sms after page %s", request.timeout, current_page)
+                break
             
             current_page += 1
             previous_count = len(results)
@@ -971,10 +1814,10 @@ async def search(request: SearchRequest, page: PageDep) -> List[SearchResult]:
             
             # If no new results were added, stop to avoid infinite loop
             if len(results) == previous_count:
-                logger.info(f"No new results found on page {current_page}. Stopping pagination.")
+                logger.info("No new results found on page %s. Stopping pagination.", current_page)
                 break
             
-            logger.info(f"Page {current_page}: collected {len(results)}/{request.count} results")
+            logger.info("Page %s: collected %s/%s results", current_page, len(results), request.count)
         
         return results
         
@@ -982,28 +1825,260 @@ async def search(request: SearchRequest, page: PageDep) -> List[SearchResult]:
         raise HTTPException(status_code=500, detail=f"Failed to search: {str(e)}")
 
 
-@app.post("/content")
-async def get_content(request: GetHtmlRequest, page: PageDep) -> str:
+@app.post("/search")
+async def search(
+    request: SearchRequest,
+    http_request: Request,
+    browser_id: BrowserIdDep = None,
+    session_id: SessionIdDep = None
+) -> List[SearchResult]:
     """
-    Get the HTML or text content of the given page.
+    Search the web using Google and return search results
+    
+    With light=True the results page is first fetched over plain HTTP, and a
+    browser page is only taken if that falls back, so a light search that
+    succeeds touches no browser or session state.
+    With image_urls=True favicons and thumbnails are returned as URLs to
+    /search/images instead of inline data URLs.
     
-    If URL is provided, navigates to it first. Otherwise, uses current page.
+    Args:
+        request: SearchRequest with query string and count of results
+        http_request: The incoming request, used to resolve the browser and session
+        browser_id: Optional browser (via X-Browser-Id header)
+        session_id: Optional session whose page is used (via X-Session-Id header)
+        
+    Returns:
+        List[SearchResult]: Array of search results with link, title, and snippet
     """
+    results = None
+    if request.light:
+        try:
+            results = await google_search_light(
+                http_request.app.state.http_client, request.query, request.count, request.timeout
+            )
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Failed to search: {str(e)}")
+        if results is None:
+            logger.info("Falling back to browser search for query: %s", request.query)
+    
+    if results is None:
+        browser_info = await get_browser_info(http_request, browser_id)
+        async with session_page(http_request, browser_info, session_id) as page:
+            results = await google_search_browser(page, request)
+    
+    if request.image_urls:
+        link_search_images(results, http_request)
+    return results
+
+
+# Chunk size for streamed /content bodies
+CONTENT_CHUNK_SIZE = 64 * 1024
+
+
+async def iter_content_chunks(content: str):
+    """Yield content as UTF-8 encoded chunks of CONTENT_CHUNK_SIZE characters."""
+    for start in range(0, len(content), CONTENT_CHUNK_SIZE):
+        yield content[start:start + CONTENT_CHUNK_SIZE].encode("utf-8")
+
+
+class TTLCache:
+    """Small in-process cache whose entries expire ttl seconds after being stored."""
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+    
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value, or None if it is missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires, value = entry
+        if expires < time.monotonic():
+            del self._entries[key]
+            return None
+        return value
+    
+    def set(self, key: Hashable, value: Any):
+        """Store a value, evicting the oldest entries beyond maxsize."""
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+    
+    def clear(self):
+        """Drop all entries."""
+        self._entries.clear()
+
+
+# Search result images handed out by URL, for SEARCH_IMAGE_TTL seconds after the search
+SEARCH_IMAGE_TTL = float(os.getenv("SEARCH_IMAGE_TTL", "600"))
+search_images = TTLCache(maxsize=1024, ttl=SEARCH_IMAGE_TTL)
+
+# data:image/...;base64,... URLs as extracted from search results
+DATA_IMAGE_URL = re.compile(r"^data:(image/[\w.+-]+);base64,(.*)$", re.S)
+
+
+def store_search_image(data_url: Optional[str], http_request: Request) -> Optional[str]:
+    """
+    Store a data: image URL in search_images and return the URL it is served from.
+    
+    Images are keyed by a hash of their content, so a favicon shared by many results
+    is stored once. Anything that isn't a base64 image data URL is returned unchanged.
+    """
+    match = DATA_IMAGE_URL.match(data_url) if data_url else None
+    if not match:
+        return data_url
     try:
-        if request.url:
-            await page.goto(request.url, wait_until=request.wait_until, timeout=request.timeout)
-        
-        if request.idle > 0:
-            await asyncio.sleep(request.idle)
-        
-        if request.return_html:
-            content = await page.content()
+        data = base64.b64decode(match.group(2), validate=True)
+    except ValueError:
+        return data_url
+    key = hashlib.blake2b(data, digest_size=16).hexdigest()
+    search_images.set(key, (match.group(1), data))
+    return str(http_request.url_for("get_search_image", key=key))
+
+
+def link_search_images(results: List[SearchResult], http_request: Request):
+    """Replace inline favicons and thumbnails in search results with /search/images URLs."""
+    for result in results:
+        result.favicon = store_search_image(result.favicon, http_request)
+        if result.metadata:
+            result.metadata.thumbnail = store_search_image(result.metadata.thumbnail, http_request)
+
+
+@app.get("/search/images/{key}", responses={200: {"content": {"image/*": {}}}})
+async def get_search_image(key: str) -> Response:
+    """Serve a favicon or thumbnail from a recent search made with image_urls=True."""
+    image = search_images.get(key)
+    if image is None:
+        raise HTTPException(status_code=404, detail="Image not found or expired")
+    media_type, data = image
+    return Response(content=data, media_type=media_type, headers={"Cache-Control": "public, max-age=86400, immutable"})
+
+
+# Recently fetched /content results for ad-hoc requests (0 disables caching)
+CONTENT_CACHE_TTL = float(os.getenv("CONTENT_CACHE_TTL", "30"))
+content_cache = TTLCache(maxsize=256, ttl=CONTENT_CACHE_TTL)
+
+
+def content_cache_key(request: GetHtmlRequest, browser_id: Optional[str], session_id: Optional[str]) -> Optional[tuple]:
+    """
+    Cache key for a /content request, or None if it must not be served from cache.
+    
+    Only ad-hoc requests for a URL are cacheable: a session expects its page to
+    end up at the URL, which a cache hit would skip. Browsers are keyed separately
+    since profiles and proxies can change what a page returns, and so are the wait
+    settings, since waiting longer lets more of a dynamic page render.
+    """
+    if CONTENT_CACHE_TTL <= 0 or session_id is not None or not request.url:
+        return None
+    return (
+        browser_id or DEFAULT_BROWSER_ID,
+        request.url,
+        request.return_html,
+        request.wait_until,
+        request.timeout,
+        request.idle
+    )
+
+
+# Cacheable /content loads currently in progress, shared by identical concurrent requests
+content_inflight: dict[tuple, asyncio.Future[Optional[str]]] = {}
+
+
+async def load_content_once(cache_key: tuple, load: Callable[[], Awaitable[str]]) -> str:
+    """
+    Load content for a cache key, sharing one load between concurrent callers.
+    
+    The first caller runs load() and stores the result in content_cache; callers
+    arriving while it runs wait for the same result instead of loading the page again.
+    If the first caller is cancelled, the waiters take the load over with their own load().
+    """
+    inflight = content_inflight.get(cache_key)
+    if inflight:
+        # Shield so one waiter giving up doesn't cancel the result for everyone else
+        content = await asyncio.shield(inflight)
+        if content is None:
+            return await load_content_once(cache_key, load)
+        return content
+    
+    future = asyncio.get_running_loop().create_future()
+    content_inflight[cache_key] = future
+    try:
+        content = await load()
+        content_cache.set(cache_key, content)
+        future.set_result(content)
+        return content
+    except BaseException as e:
+        if isinstance(e, asyncio.CancelledError):
+            # None tells waiters to load it themselves; cancelling the future would
+            # hand them a CancelledError, which slips past their `except Exception`
+            future.set_result(None)
         else:
-            content = await page.inner_text("body")
+            future.set_exception(e)
+            # Mark the exception as retrieved in case nobody else was waiting
+            future.exception()
+        raise
+    finally:
+        content_inflight.pop(cache_key, None)
+
+
+@app.post(
+    "/content",
+    responses={200: {"content": {"text/html": {}, "text/plain": {}}, "description": "Raw body when stream is true"}}
+)
+async def get_content(
+    request: GetHtmlRequest,
+    http_request: Request,
+    browser_id: BrowserIdDep = None,
+    session_id: SessionIdDep = None
+) -> str:
+    """
+    Get the HTML or text content of the given page.
+    
+    If URL is provided, navigates to it first, unless the page is already there
+    (set force_reload to navigate anyway). Otherwise, uses current page.
+    Requests without a session are served from a short-lived cache when the same
+    URL was fetched recently, and identical concurrent requests share one page load
+    (set no_cache or force_reload to bypass both). A page, and a slot of the
+    browser concurrency limit, is only taken when the page actually has to be read.
+    With stream=True the content is sent as a raw text/html (or text/plain) body in
+    chunks instead of a JSON-encoded string.
+    """
+    cache_key = content_cache_key(request, browser_id, session_id)
+    use_cache = cache_key is not None and not (request.no_cache or request.force_reload)
+    content = content_cache.get(cache_key) if use_cache else None
+    
+    if content is None:
+        browser_info = await get_browser_info(http_request, browser_id)
         
-        return content
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to get content: {str(e)}")
+        async def load_content() -> str:
+            async with session_page(http_request, browser_info, session_id) as page:
+                await ensure_at(page, request.url, request.wait_until, request.timeout, request.force_reload)
+                
+                await wait_for_idle(page, request.idle)
+                
+                if request.return_html:
+                    return await page.content()
+                return await page.inner_text("body")
+        
+        try:
+            if use_cache:
+                # Concurrent waiters share the first caller's page instead of taking their own
+                content = await load_content_once(cache_key, load_content)
+            else:
+                content = await load_content()
+                if cache_key:
+                    content_cache.set(cache_key, content)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Failed to get content: {str(e)}")
+    
+    if request.stream:
+        media_type = "text/html" if request.return_html else "text/plain"
+        return StreamingResponse(iter_content_chunks(content), media_type=f"{media_type}; charset=utf-8")
+    
+    # Encode the (possibly multi-MB) string straight to the JSON body, skipping response model validation
+    return ORJSONResponse(content)
 
 
 @app.post("/selectors")
@@ -1011,187 +2086,292 @@ async def execute_selectors(request: SelectorRequest, page: PageDep) -> List[Sel
     """
     Execute CSS or XPath selectors on a page and perform actions on matched elements.
     
-    Uses native Playwright locators for better performance.
-    If URL is provided, navigates to it first. Otherwise, uses current page.
+    Consecutive read-only actions (html, text, attribute) across selectors are resolved
+    together in a single page.evaluate call. Mutating actions (click, fill, remove) use
+    native Playwright locators and run in request order, so reads always observe the
+    effects of the mutations listed before them. With batch=False, or if the batched call
+    itself fails, the queued reads run concurrently through Playwright locators instead.
+    If URL is provided, navigates to it first, unless the page is already there
+    (set force_reload to navigate anyway). Otherwise, uses current page.
     """
     try:
-        if request.url:
-            await page.goto(request.url, wait_until=request.wait_until, timeout=request.timeout)
+        navigated = await ensure_at(page, request.url, request.wait_until, request.timeout, request.force_reload)
         
-        if request.idle > 0:
-            await asyncio.sleep(request.idle)
+        await wait_for_idle(page, request.idle)
         
-        results = []
+        action_results: List[List[Optional[ActionResult]]] = [
+            [None] * len(selector.actions) for selector in request.selectors
+        ]
+        pending: List[tuple[int, int]] = []
+        # Right after navigation the document can't have the page helpers installed yet
+        fresh_document = navigated
         
-        for selector in request.selectors:
-            action_results = []
-            
-            for action in selector.actions:
+        def record(selector_idx: int, action_idx: int, outcome: Union[List[str], Exception]):
+            selector = request.selectors[selector_idx]
+            action = selector.actions[action_idx]
+            if isinstance(outcome, Exception):
+                logger.warning("Action %s failed for selector %s: %s", action.action, selector.name, outcome)
+                values = [f"error: {str(outcome)}"]
+            else:
+                values = outcome
+                log_selector_action(selector, action, values)
+            action_results[selector_idx][action_idx] = ActionResult(
+                action=action.action,
+                values=values if values else []
+            )
+        
+        async def flush_pending():
+            nonlocal fresh_document
+            if not pending:
+                return
+            items = [(request.selectors[i], request.selectors[i].actions[j]) for i, j in pending]
+            outcomes = None
+            if request.batch:
                 try:
-                    values = []
-                    
-                    if isinstance(action, HtmlAction):
-                        values = await get_elements_html(page, selector.type, selector.value)
-                        logger.info(f"Got {len(values)} HTML elements for selector {selector.name}")
-                        
-                    elif isinstance(action, TextAction):
-                        values = await get_elements_text(page, selector.type, selector.value)
-                        logger.info(f"Got {len(values)} text values for selector {selector.name}")
-                        
-                    elif isinstance(action, ClickAction):
-                        values = await click_elements(page, selector.type, selector.value, action.nth)
-                        nth_desc = "first" if action.nth == 0 else ("last" if action.nth == -1 else "all")
-                        logger.info(f"Clicked {len(values)} elements ({nth_desc}) for selector {selector.name}")
-                        
-                    elif isinstance(action, FillAction):
-                        values = await fill_elements(page, selector.type, selector.value, action.value, action.nth)
-                        nth_desc = "first" if action.nth == 0 else ("last" if action.nth == -1 else "all")
-                        logger.info(f"Filled {len(values)} elements ({nth_desc}) for selector {selector.name}")
-                            
-                    elif isinstance(action, AttributeAction):
-                        values = await get_elements_attribute(page, selector.type, selector.value, action.name)
-                        logger.info(f"Got {len(values)} attribute values for selector {selector.name}")
-                    
-                    elif isinstance(action, RemoveAction):
-                        values = await remove_elements(page, selector.type, selector.value, action.nth)
-                        nth_desc = "first" if action.nth == 0 else ("last" if action.nth == -1 else "all")
-                        logger.info(f"Removed {len(values)} elements ({nth_desc}) for selector {selector.name}")
-                    
-                    action_results.append(ActionResult(
-                        action=action.action,
-                        values=values if values else []
-                    ))
-                    
+                    outcomes = await read_selectors_batch(page, items, fresh_document=fresh_document)
                 except Exception as e:
-                    logger.warning(f"Action {action.action} failed for selector {selector.name}: {e}")
-                    action_results.append(ActionResult(
-                        action=action.action,
-                        values=[f"error: {str(e)}"]
-                    ))
-            
-            results.append(SelectorResult(
-                name=selector.name,
-                results=action_results
-            ))
+                    logger.info("Batched read of %d actions failed (%s), using locators", len(items), e)
+            if outcomes is None:
+                # Reads don't affect each other, so their locator round-trips can overlap
+                outcomes = await asyncio.gather(
+                    *(run_selector_action(page, selector, action) for selector, action in items),
+                    return_exceptions=True
+                )
+            for (i, j), outcome in zip(pending, outcomes):
+                record(i, j, outcome)
+            pending.clear()
+            fresh_document = False
         
-        return results
+        for selector_idx, selector in enumerate(request.selectors):
+            for action_idx, action in enumerate(selector.actions):
+                if isinstance(action, READ_ONLY_ACTIONS):
+                    pending.append((selector_idx, action_idx))
+                    continue
+                
+                # Reads queued before a mutation must see the page as it was
+                await flush_pending()
+                try:
+                    outcome = await run_selector_action(page, selector, action)
+                except Exception as e:
+                    outcome = e
+                record(selector_idx, action_idx, outcome)
+        
+        await flush_pending()
+        
+        return [
+            SelectorResult(name=selector.name, results=action_results[i])
+            for i, selector in enumerate(request.selectors)
+        ]
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to execute selectors: {str(e)}")
 
 
+class InteractionResult:
+    """What an /interact action list produced: the performed actions, plus the latest content or screenshot."""
+    def __init__(self):
+        # (message, args) pairs, only formatted when the summary is actually returned
+        self.actions: List[tuple[str, tuple]] = []
+        self.content: Optional[str] = None
+        self.screenshot: Optional[bytes] = None
+        self.screenshot_type = "image/png"
+        # Page HTML/text read since the last action that could have changed the page
+        self.reads: dict[type, str] = {}
+    
+    def record(self, message: str, *args):
+        """Note a performed action; message is %-formatted with args like a log message."""
+        self.actions.append((message, args))
+    
+    def summary(self) -> List[str]:
+        """The performed actions as readable strings."""
+        return [message % args if args else message for message, args in self.actions]
+
+
+async def _interact_move(page: Page, action: MoveAction, result: InteractionResult):
+    await page.mouse.move(action.x, action.y, steps=action.steps)
+    result.record("moved to (%s, %s)", action.x, action.y)
+    logger.info("Moved mouse to (%s, %s) with %s steps", action.x, action.y, action.steps)
+
+
+async def _interact_mouse_click(page: Page, action: MouseClickAction, result: InteractionResult):
+    await page.mouse.click(
+        action.x, 
+        action.y, 
+        button=action.button,
+        click_count=action.click_count,
+        delay=action.delay
+    )
+    result.record("clicked at (%s, %s) with %s button", action.x, action.y, action.button)
+    logger.info("Clicked at (%s, %s) with %s button", action.x, action.y, action.button)
+
+
+async def _interact_scroll(page: Page, action: ScrollAction, result: InteractionResult):
+    await page.mouse.wheel(action.x, action.y)
+    result.record("scrolled by (%s, %s)", action.x, action.y)
+    logger.info("Scrolled by (%s, %s)", action.x, action.y)
+
+
+async def _interact_scroll_to_bottom(page: Page, action: ScrollToBottomAction, result: InteractionResult):
+    # Smooth scroll to bottom logic
+    start_time = asyncio.get_event_loop().time()
+    
+    while True:
+        # Check timeout - strict exit condition
+        if asyncio.get_event_loop().time() - start_time > action.timeout:
+            logger.info("Scroll to bottom finished (timeout %ss reached)", action.timeout)
+            break
+        
+        # Scroll down by step
+        #await page.evaluate(f"window.scrollBy(0, {action.step_pixels})")
+        await page.mouse.wheel(0, action.step_pixels)
+        await asyncio.sleep(action.step_delay)
+        
+        # If we just want to keep scrolling until timeout, we don't strictly need to break at bottom.
+        # However, to be efficient, we can check if we really are stuck at bottom.
+        # But user requested "scroll until timeout", which implies forcing scroll attempts
+        # even if it looks like bottom (useful for aggressive infinite scrolls or tricky DOMs).
+        
+        # Optional: We can still check if we are at bottom to maybe speed up 'step_delay' 
+        # or just unconditionally scroll until timeout. 
+        # Based on user request "scroll not until bottom but until timeout is reached",
+        # we will prioritize the timeout loop.
+    
+    result.record("scrolled (duration based)")
+    logger.info("Scrolled (duration based)")
+
+
+async def _interact_idle(page: Page, action: IdleAction, result: InteractionResult):
+    if action.mode == "sleep":
+        await asyncio.sleep(action.duration)
+        result.record("waited %ss", action.duration)
+        logger.info("Waited %s seconds", action.duration)
+        return
+    try:
+        await page.wait_for_load_state(action.mode, timeout=action.duration * 1000)
+    except PlaywrightTimeoutError:
+        pass
+    result.record("waited for %s (up to %ss)", action.mode, action.duration)
+    logger.info("Waited for %s (up to %s seconds)", action.mode, action.duration)
+
+
+@lru_cache(maxsize=256)
+def basic_auth_header(username: str, password: str) -> str:
+    """
+    Build an HTTP Basic Authorization header value.
+    
+    Scripted flows send the same credentials over and over, so recent ones are
+    kept; the cache is bounded, but does hold them in memory for the process lifetime.
+    """
+    credentials = base64.b64encode(f"{username}:{password}".encode()).decode()
+    return f"Basic {credentials}"
+
+
+async def _interact_login(page: Page, action: LoginAction, result: InteractionResult):
+    if action.username and action.password:
+        await page.context.set_extra_http_headers({"Authorization": basic_auth_header(action.username, action.password)})
+        result.record("set http credentials for user '%s'", action.username)
+        logger.info("Set HTTP Basic Auth credentials for user '%s'", action.username)
+    else:
+        # Clear credentials by setting empty headers
+        await page.context.set_extra_http_headers({})
+        result.record("cleared http credentials")
+        logger.info("Cleared HTTP Basic Auth credentials")
+
+
+async def _interact_html(page: Page, action: HtmlAction, result: InteractionResult):
+    if HtmlAction not in result.reads:
+        result.reads[HtmlAction] = await page.content()
+    result.content = result.reads[HtmlAction]
+    result.record("got html content")
+    logger.info("Got HTML content")
+
+
+async def _interact_text(page: Page, action: TextAction, result: InteractionResult):
+    if TextAction not in result.reads:
+        result.reads[TextAction] = await page.inner_text("body")
+    result.content = result.reads[TextAction]
+    result.record("got text content")
+    logger.info("Got text content")
+
+
+async def _interact_screenshot(page: Page, action: ScreenshotAction, result: InteractionResult):
+    result.screenshot = await capture_screenshot(page, action.format, action.quality, action.full_page)
+    if action.format == "png" and action.optimize:
+        result.screenshot = await optimize_png(result.screenshot)
+    result.screenshot_type = f"image/{action.format}"
+    result.record("screenshot taken (full_page=%s, format=%s)", action.full_page, action.format)
+    logger.info("Screenshot taken (full_page=%s, format=%s)", action.full_page, action.format)
+
+
+# Handler for each /interact action model, looked up by exact type
+INTERACT_ACTION_HANDLERS: dict[type, Callable[[Page, Any, InteractionResult], Awaitable[None]]] = {
+    MoveAction: _interact_move,
+    MouseClickAction: _interact_mouse_click,
+    ScrollAction: _interact_scroll,
+    ScrollToBottomAction: _interact_scroll_to_bottom,
+    IdleAction: _interact_idle,
+    LoginAction: _interact_login,
+    HtmlAction: _interact_html,
+    TextAction: _interact_text,
+    ScreenshotAction: _interact_screenshot,
+}
+
+# Actions that leave the page as it was, so content read before them is still current
+PAGE_PRESERVING_ACTIONS = (HtmlAction, TextAction, ScreenshotAction)
+
+
+def coalesce_actions(actions: List[Action]) -> List[Action]:
+    """
+    Merge runs of consecutive scroll or idle actions into a single action each.
+    
+    A burst of scrolls becomes one wheel event with the summed deltas and a run of
+    sleeps one sleep, so the page sees the same total movement with one round-trip.
+    Load state waits are left alone, since each one ends early on its own.
+    """
+    merged: List[Action] = []
+    for (kind, mode), group in groupby(actions, key=lambda action: (type(action), getattr(action, "mode", None))):
+        group = list(group)
+        if len(group) > 1 and kind is ScrollAction:
+            merged.append(ScrollAction(x=sum(a.x for a in group), y=sum(a.y for a in group)))
+        elif len(group) > 1 and kind is IdleAction and mode == "sleep":
+            merged.append(IdleAction(duration=sum(a.duration for a in group)))
+        else:
+            merged.extend(group)
+    return merged
+
+
 @app.post("/interact")
 async def interact(request: InteractRequest, page: PageDep) -> Response:
     """
     Unified endpoint for page interactions using an actions list.
     
-    If URL is provided, navigates to it first. Otherwise, uses current page.
+    If URL is provided, navigates to it first, unless the page is already there
+    (set force_reload to navigate anyway). Otherwise, uses current page.
     Actions are executed in the order they appear in the list.
     """
     try:
-        actions_performed = []
-        screenshot_bytes = None
-        content_result = None
+        result = InteractionResult()
         
-        if request.url:
-            await page.goto(request.url, wait_until=request.wait_until, timeout=request.timeout)
-            actions_performed.append(f"navigated to {request.url}")
+        if await ensure_at(page, request.url, request.wait_until, request.timeout, request.force_reload):
+            result.record("navigated to %s", request.url)
         
-        if request.idle > 0:
-            await asyncio.sleep(request.idle)
+        await wait_for_idle(page, request.idle)
         
-        for action in request.actions:
-            if isinstance(action, MoveAction):
-                await page.mouse.move(action.x, action.y, steps=action.steps)
-                actions_performed.append(f"moved to ({action.x}, {action.y})")
-                logger.info(f"Moved mouse to ({action.x}, {action.y}) with {action.steps} steps")
-                
-            elif isinstance(action, MouseClickAction):
-                await page.mouse.click(
-                    action.x, 
-                    action.y, 
-                    button=action.button,
-                    click_count=action.click_count,
-                    delay=action.delay
-                )
-                actions_performed.append(f"clicked at ({action.x}, {action.y}) with {action.button} button")
-                logger.info(f"Clicked at ({action.x}, {action.y}) with {action.button} button")
-                
-            elif isinstance(action, ScrollAction):
-                await page.mouse.wheel(action.x, action.y)
-                actions_performed.append(f"scrolled by ({action.x}, {action.y})")
-                logger.info(f"Scrolled by ({action.x}, {action.y})")
-            
-            elif isinstance(action, ScrollToBottomAction):
-                # Smooth scroll to bottom logic
-                start_time = asyncio.get_event_loop().time()
-                
-                while True:
-                    # Check timeout - strict exit condition
-                    if asyncio.get_event_loop().time() - start_time > action.timeout:
-                        logger.info(f"Scroll to bottom finished (timeout {action.timeout}s reached)")
-                        break
-                    
-                    # Scroll down by step
-                    #await page.evaluate(f"window.scrollBy(0, {action.step_pixels})")
-                    await page.mouse.wheel(0, action.step_pixels)
-                    await asyncio.sleep(action.step_delay)
-                    
-                    # If we just want to keep scrolling until timeout, we don't strictly need to break at bottom.
-                    # However, to be efficient, we can check if we really are stuck at bottom.
-                    # But user requested "scroll until timeout", which implies forcing scroll attempts
-                    # even if it looks like bottom (useful for aggressive infinite scrolls or tricky DOMs).
-                    
-                    # Optional: We can still check if we are at bottom to maybe speed up 'step_delay' 
-                    # or just unconditionally scroll until timeout. 
-                    # Based on user request "scroll not until bottom but until timeout is reached",
-                    # we will prioritize the timeout loop.
-                
-                actions_performed.append("scrolled (duration based)")
-                logger.info("Scrolled (duration based)")
-                
-            elif isinstance(action, IdleAction):
-                await asyncio.sleep(action.duration)
-                actions_performed.append(f"waited {action.duration}s")
-                logger.info(f"Waited {action.duration} seconds")
-            
-            elif isinstance(action, LoginAction):
-                import base64
-                if action.username and action.password:
-                    credentials = base64.b64encode(f"{action.username}:{action.password}".encode()).decode()
-                    await page.context.set_extra_http_headers({"Authorization": f"Basic {credentials}"})
-                    actions_performed.append(f"set http credentials for user '{action.username}'")
-                    logger.info(f"Set HTTP Basic Auth credentials for user '{action.username}'")
-                else:
-                    # Clear credentials by setting empty headers
-                    await page.context.set_extra_http_headers({})
-                    actions_performed.append("cleared http credentials")
-                    logger.info("Cleared HTTP Basic Auth credentials")
-                
-            elif isinstance(action, HtmlAction):
-                content_result = await page.content()
-                actions_performed.append("got html content")
-                logger.info("Got HTML content")
-                
-            elif isinstance(action, TextAction):
-                content_result = await page.inner_text("body")
-                actions_performed.append("got text content")
-                logger.info("Got text content")
-                
-            elif isinstance(action, ScreenshotAction):
-                screenshot_bytes = await page.screenshot(full_page=action.full_page, type="png")
-                actions_performed.append(f"screenshot taken (full_page={action.full_page})")
-                logger.info(f"Screenshot taken (full_page={action.full_page})")
+        for action in coalesce_actions(request.actions):
+            handler = INTERACT_ACTION_HANDLERS.get(type(action))
+            if handler:
+                if not isinstance(action, PAGE_PRESERVING_ACTIONS):
+                    result.reads.clear()
+                await handler(page, action, result)
         
-        if screenshot_bytes:
-            return Response(content=screenshot_bytes, media_type="image/png")
+        if result.screenshot:
+            return Response(content=result.screenshot, media_type=result.screenshot_type)
         
-        if content_result is not None:
-            return Response(content=content_result, media_type="text/plain")
+        if result.content is not None:
+            return Response(content=result.content, media_type="text/plain")
         
-        import json
         return Response(
-            content=json.dumps({"status": "success", "actions": actions_performed}),
+            content=orjson.dumps({"status": "success", "actions": result.summary()}),
             media_type="application/json"
         )
         
@@ -1202,6 +2382,9 @@ async def interact(request: InteractRequest, page: PageDep) -> Response:
 if __name__ == "__main__":
     import uvicorn
 
+    # A single process on purpose: sessions and pages live in this process's memory,
+    # and a persistent profile can only be opened by one Chrome instance at a time.
+    # uvicorn picks up the uvloop and httptools dependencies on its own when installed
     uvicorn.run(
         app,
         host="0.0.0.0",
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 from typing import Literal, Optional, List, Union, Annotated
 from pydantic import Discriminator
 
@@ -6,14 +6,20 @@ from pydantic import Discriminator
 class SearchRequest(BaseModel):
     query: str = Field(..., description="The search query string")
     count: int = Field(default=5, description="The maximum number of search results requested")
+    timeout: float = Field(default=5000, description="Maximum time in milliseconds to wait for search results to appear")
+    light: bool = Field(default=False, description="Fetch and parse results over plain HTTP without rendering them in the browser. Falls back to the browser when blocked or no results are found")
+    image_urls: bool = Field(default=False, description="Return favicons and thumbnails as URLs to fetch them from instead of inline base64 data URLs, making the response much smaller")
 
 
 class GetHtmlRequest(BaseModel):
-    url: Optional[str] = Field(default=None, description="The URL to get the HTML from. If not provided, uses current page.")
+    url: Optional[str] = Field(default=None, description="The URL to get the HTML from. Skipped if the page is already at this URL. If not provided, uses current page.")
     wait_until: Literal["commit", "domcontentloaded", "load", "networkidle"] = Field(default="commit", description="The wait until event to wait for")
     timeout: float = Field(default=3600, description="The timeout in milliseconds")
-    idle: float = Field(default=1.5, description="Idle time in milliseconds to wait after page loaded")
+    idle: float = Field(default=1.5, description="Maximum time in seconds to wait for the network to go idle after page loaded")
     return_html: bool = Field(default=True, description="If True, return HTML content. If False, return only inner text")
+    force_reload: bool = Field(default=False, description="Navigate to url even if the page is already there")
+    stream: bool = Field(default=False, description="If True, stream the content as a raw text/html or text/plain body instead of a JSON string")
+    no_cache: bool = Field(default=False, description="If True, always load the page instead of using a recently cached result")
 
 
 # ==================== Action Models ====================
@@ -114,6 +120,15 @@ class ScreenshotAction(Action):
     """Take a screenshot of the page"""
     action: Literal["screenshot"] = Field(default="screenshot", description="Takes a screenshot of the page")
     full_page: bool = Field(default=False, description="If True, capture full scrollable page")
+    format: Literal["png", "jpeg", "webp"] = Field(
+        default="png",
+        description="Image format. PNG is lossless but largest; JPEG and WebP are much smaller and faster to encode, WebP keeping text sharper"
+    )
+    quality: int = Field(default=80, ge=0, le=100, description="JPEG/WebP quality (0-100). Ignored for PNG")
+    optimize: bool = Field(
+        default=False,
+        description="Losslessly recompress PNG output with oxipng, typically 20-40% smaller at the cost of server CPU. Ignored for JPEG/WebP"
+    )
 
 
 class ScrollAction(Action):
@@ -164,10 +179,22 @@ class IdleAction(Action):
     Wait for a specified duration.
     
     Useful for adding delays between actions, waiting for animations,
-    or giving the page time to load dynamic content.
+    or giving the page time to load dynamic content. With a load state mode
+    the wait ends as soon as the page reaches that state.
     """
     action: Literal["idle"] = Field(default="idle", description="Waits for specified duration")
-    duration: float = Field(..., description="Duration to wait in seconds")
+    duration: float = Field(..., ge=0, description="Duration to wait in seconds; must be greater than 0 for load state modes")
+    mode: Literal["sleep", "networkidle", "domcontentloaded", "load"] = Field(
+        default="sleep",
+        description="sleep waits the full duration; the other modes wait for that load state, using duration as the upper bound"
+    )
+    
+    @model_validator(mode="after")
+    def check_load_state_bound(self) -> "IdleAction":
+        # Playwright reads a timeout of 0 as no timeout, so the wait could never end
+        if self.mode != "sleep" and self.duration == 0:
+            raise ValueError(f"duration must be greater than 0 when waiting for {self.mode}")
+        return self
 
 
 class LoginAction(Action):
@@ -249,14 +276,24 @@ class Selector(BaseModel):
         default_factory=lambda: [HtmlAction()],
         description="List of actions to perform on selected elements. Default is [{'action': 'html'}]"
     )
+    max_length: Optional[int] = Field(
+        default=None,
+        ge=1,
+        description="Truncate each html/text value to this many characters, in the browser before it is sent back. No limit by default"
+    )
 
 
 class SelectorRequest(BaseModel):
-    url: Optional[str] = Field(default=None, description="The URL to execute selectors on. If not provided, uses current page.")
+    url: Optional[str] = Field(default=None, description="The URL to execute selectors on. Skipped if the page is already at this URL. If not provided, uses current page.")
+    force_reload: bool = Field(default=False, description="Navigate to url even if the page is already there")
     selectors: list[Selector] = Field(..., description="List of selectors to execute")
     wait_until: Literal["commit", "domcontentloaded", "load", "networkidle"] = Field(default="commit", description="The wait until event to wait for")
     timeout: float = Field(default=3600, description="The timeout in milliseconds")
-    idle: float = Field(default=1.5, description="Idle time in milliseconds to wait after page loaded")
+    idle: float = Field(default=1.5, description="Maximum time in seconds to wait for the network to go idle after page loaded")
+    batch: bool = Field(
+        default=True,
+        description="Resolve consecutive html/text/attribute actions in a single in-page call. Set to False to run them through Playwright locators instead, concurrently"
+    )
 
 
 class InteractRequest(BaseModel):
@@ -330,8 +367,9 @@ class InteractRequest(BaseModel):
             {"action": "text"}
         ]}
     """
-    url: Optional[str] = Field(default=None, description="URL to navigate to. If not provided, uses current page.")
+    url: Optional[str] = Field(default=None, description="URL to navigate to. Skipped if the page is already at this URL. If not provided, uses current page.")
+    force_reload: bool = Field(default=False, description="Navigate to url even if the page is already there")
     wait_until: Literal["commit", "domcontentloaded", "load", "networkidle"] = Field(default="commit", description="Wait until event when navigating")
     timeout: float = Field(default=30000, description="Navigation timeout in milliseconds")
-    idle: float = Field(default=0, description="Idle time in seconds to wait after page loaded")
+    idle: float = Field(default=0, description="Maximum time in seconds to wait for the network to go idle after page loaded")
     actions: List[InteractAction] = Field(..., description="List of actions to perform in order")
\ No newline at end of file
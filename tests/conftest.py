@@ -16,11 +16,15 @@ def mock_page():
     page.inner_text = AsyncMock(return_value="Test content")
     page.query_selector_all = AsyncMock(return_value=[])
     page.close = AsyncMock()
+    page.is_closed = MagicMock(return_value=False)
+    page.on = MagicMock()
+    page.remove_listener = MagicMock()
     page.screenshot = AsyncMock(return_value=b"fake_png_bytes")
     
     # Mock locator for xpath selectors
     mock_locator = MagicMock()
     mock_locator.count = AsyncMock(return_value=0)
+    mock_locator.evaluate_all = AsyncMock(return_value=[])
     page.locator = MagicMock(return_value=mock_locator)
     
     # Mock mouse for interact actions
@@ -33,6 +37,11 @@ def mock_page():
     page.context = MagicMock()
     page.context.set_extra_http_headers = AsyncMock()
     
+    # Mock CDP session for screenshots
+    cdp_session = MagicMock()
+    cdp_session.send = AsyncMock(return_value={"data": "ZmFrZV9wbmdfYnl0ZXM="})
+    page.context.new_cdp_session = AsyncMock(return_value=cdp_session)
+    
     return page
 
 
@@ -68,37 +77,32 @@ def mock_playwright(mock_browser_context):
 def mock_browser_manager(mock_playwright, mock_browser_context, mock_browser, mock_page):
     """Create a mock BrowserManager object."""
     from pathlib import Path
+    from main import BrowserInfo
     
-    # Create a mock BrowserInfo
-    browser_info = MagicMock()
-    browser_info.browser = mock_browser
-    browser_info.context = mock_browser_context
-    browser_info.profile_path = Path("./profiles/default")
-    browser_info.pages = {}
+    # Real BrowserInfo around mocked browser objects, so page pooling is exercised
+    browser_info = BrowserInfo(mock_browser, mock_browser_context, Path("./profiles/default"))
+    # Background pool top-ups are stubbed so page creation counts stay deterministic
+    browser_info.fill_pool = AsyncMock()
+    browser_info.fill_isolated_pool = AsyncMock()
     
     # Create mock browser manager
     manager = MagicMock()
     manager.playwright = mock_playwright
-    manager.browsers = {"./profiles/default": browser_info}
+    manager.browsers = {"default": browser_info}
     
     # Mock methods
     async def mock_create_browser(profile_uid=None, proxy=None):
-        new_browser_info = MagicMock()
-        new_browser_info.browser = mock_browser
-        new_browser_info.context = mock_browser_context
         # Use profile_uid if provided, otherwise random ID
         browser_id = profile_uid if profile_uid else "test-uuid"
-        
-        new_browser_info.profile_path = Path(f"./profiles/{browser_id}")
-        new_browser_info.pages = {}
+        new_browser_info = BrowserInfo(mock_browser, mock_browser_context, Path(f"./profiles/{browser_id}"))
+        new_browser_info.fill_pool = AsyncMock()
+        new_browser_info.fill_isolated_pool = AsyncMock()
         
         manager.browsers[browser_id] = new_browser_info
         return browser_id, new_browser_info
     
     manager.create_browser = mock_create_browser
     manager.get_browser = MagicMock(return_value=browser_info)
-    manager.get_default_browser = MagicMock(return_value=browser_info)
-    manager.get_default_browser_id = MagicMock(return_value="./profiles/default")
     manager.close_browser = AsyncMock(return_value=True)
     manager.shutdown = AsyncMock()
     
@@ -115,7 +119,8 @@ def client(mock_playwright, mock_browser_context, mock_page, mock_browser_manage
         mock_async_playwright.return_value.start = AsyncMock(return_value=mock_playwright)
         
         # Import app after patching
-        from main import app, browser_manager
+        from main import app, browser_manager, content_cache
+        content_cache.clear()
         
         # Pre-configure app state to skip lifespan startup
         app.state.playwright = mock_playwright
@@ -125,9 +130,7 @@ def client(mock_playwright, mock_browser_context, mock_page, mock_browser_manage
         with patch.object(browser_manager, 'playwright', mock_playwright), \
              patch.object(browser_manager, 'browsers', mock_browser_manager.browsers), \
              patch.object(browser_manager, 'create_browser', mock_browser_manager.create_browser), \
-             patch.object(browser_manager, 'get_browser', mock_browser_manager.get_browser), \
-             patch.object(browser_manager, 'get_default_browser', mock_browser_manager.get_default_browser), \
-             patch.object(browser_manager, 'get_default_browser_id', mock_browser_manager.get_default_browser_id):
+             patch.object(browser_manager, 'get_browser', mock_browser_manager.get_browser):
             
             with TestClient(app) as test_client:
                 yield test_client